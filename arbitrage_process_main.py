@@ -24,6 +24,10 @@ from logic.realtime_hedge_engine import RealtimeHedgeEngine, TradeConfig, RiskCo
 from logic.position_hedge_engine import create_hedge_engine, HedgeConfig
 from cex_tools.exchange_ws.position_stream_factory import PositionStreamManager
 from config.env_config import env_config
+from utils.coroutine_utils import install_uvloop
+
+# 子进程重新导入本模块时同样生效
+install_uvloop()
 
 
 @dataclass
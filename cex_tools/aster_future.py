@@ -37,6 +37,8 @@ class AsterFuture:
     def __init__(self, key=None, secret=None, erc20_deposit_addr="", **kwargs):
         self.api_key = key
         self.api_secret = secret
+        # 预先完成密钥填充的 HMAC 模板, 每次签名只需 copy 后 update
+        self._hmac_template = hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256) if secret else None
         self.base_url = "https://fapi.asterdex.com"
         self.erc20_deposit_addr = erc20_deposit_addr
         self.exchange_code = ExchangeEnum.ASTER
@@ -62,11 +64,9 @@ class AsterFuture:
         :param query_string: 查询字符串
         :return: 签名hex字符串
         """
-        return hmac.new(
-            self.api_secret.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        h = self._hmac_template.copy()
+        h.update(query_string.encode('utf-8'))
+        return h.hexdigest()
 
     def _generate_nonce(self) -> int:
         """生成nonce (microsecond timestamp)"""
@@ -151,6 +151,12 @@ class AsyncExchangeAdapter:
         """获取K线数据"""
         return await self._call_method('get_klines', symbol, interval, limit)
 
+    async def get_order_books(self, symbol: str, limit: int = 20):
+        """获取订单簿"""
+        if not hasattr(self.exchange, 'get_order_books') and hasattr(self.exchange, 'get_orderbooks'):
+            return await self._call_method('get_orderbooks', symbol, limit)
+        return await self._call_method('get_order_books', symbol, limit)
+
     async def get_funding_rate(self, symbol: str, apy: bool = True) -> float:
         """获取资金费率"""
         return await self._call_method('get_funding_rate', symbol, apy)
@@ -12,7 +12,7 @@ import ccxt
 from binance.um_futures import UMFutures
 from loguru import logger
 
-from cex_tools.exchange_model.position_model import BinancePositionDetail
+from cex_tools.exchange_model.position_model import BinancePositionDetail, parse_binance_positions
 from cex_tools.exchange_model.order_model import BinanceOrder, BinanceOrderStatus
 from cex_tools.exchange_model.kline_bar_model import BinanceKlineBar
 from cex_tools.exchange_model.orderbook_model import BinanceOrderBook
@@ -122,6 +122,12 @@ class BinanceFuture(UMFutures):
         binance_positions = list(map(lambda a: BinancePositionDetail(a, self.exchange_code), binance_positions))
         return binance_positions
 
+    def get_all_cur_positions_array(self):
+        """获取当前所有仓位的列式数据 PositionsSoA, 适合大批量仓位的向量化计算"""
+        binance_positions = self.get_position_risk(recvWindow=self.recvWindow)
+        binance_positions = [p for p in binance_positions if float(p.get("positionAmt")) != 0]
+        return parse_binance_positions(binance_positions)
+
     def get_position(self, symbol):
         symbol = self.convert_symbol(symbol)
         binance_positions = self.get_position_risk(symbol=symbol, recvWindow=self.recvWindow)
@@ -6,6 +6,33 @@
 @Description :
 @Time        : 2023/12/6 15:34
 """
+import sys
+from functools import lru_cache
+
+
+# 交易对集合很小且反复出现, 以下转换缓存结果并驻留字符串, 下游比较可按引用判断
+@lru_cache(maxsize=4096)
+def okx_inst_id_to_pair(inst_id):
+    """OKX instId 转标准交易对: BTC-USDT-SWAP -> BTCUSDT, 一次后缀裁剪 + 一次替换"""
+    return sys.intern(inst_id.removesuffix("-SWAP").replace("-", ""))
+
+
+@lru_cache(maxsize=4096)
+def pair_to_symbol(pair):
+    """BTCUSDT -> BTC"""
+    return sys.intern(pair.replace("USDT", ""))
+
+
+@lru_cache(maxsize=4096)
+def symbol_to_pair(symbol):
+    """BTC -> BTCUSDT"""
+    return sys.intern(symbol + "USDT")
+
+
+def get_float(data, key, default=0):
+    """读取字段并转换为 float, 字段为空时返回默认值, 只做一次字典查找"""
+    v = data.get(key)
+    return float(v) if v else default
 
 
 class TradeDirection:
@@ -14,10 +41,21 @@ class TradeDirection:
 
 
 class BaseModel:
+    __slots__ = ()
+
+    def _field_items(self):
+        """实例字段, 同时兼容 __dict__ 与 __slots__ 定义的属性"""
+        fields = {}
+        for cls in reversed(type(self).__mro__):
+            for name in cls.__dict__.get("__slots__", ()):
+                if hasattr(self, name):
+                    fields[name] = getattr(self, name)
+        fields.update(getattr(self, "__dict__", {}))
+        return fields.items()
 
     def to_json(self):
         ret = {}
-        for k, v in self.__dict__.items():
+        for k, v in self._field_items():
             if isinstance(v, (int, str)):
                 ret[k] = v
             elif isinstance(v, list):
@@ -35,9 +73,9 @@ class BaseModel:
             if isinstance(v, (int, str)):
                 self.__setattr__(k, v)
             elif isinstance(v, list):
-                self.__setattr__(k, [BaseModel().from_json(item) for item in v])
+                self.__setattr__(k, [DictModel().from_json(item) for item in v])
             elif isinstance(v, dict):
-                self.__setattr__(k, {k1: BaseModel().from_json(v1) if isinstance(v1, dict) else v1 for k1, v1 in
+                self.__setattr__(k, {k1: DictModel().from_json(v1) if isinstance(v1, dict) else v1 for k1, v1 in
                                      v.items()})
             else:
                 self.__setattr__(k, v)
@@ -45,7 +83,7 @@ class BaseModel:
 
     def __str__(self):
         infos = list(filter(lambda x: x is not None,
-                            map(lambda x: '%s: %s' % (x[0], x[1]) if x[1] is not None else None, vars(self).items())))
+                            map(lambda x: '%s: %s' % (x[0], x[1]) if x[1] is not None else None, self._field_items())))
         return '\n%s(%s)' % (
             type(self).__name__,
             '\n'.join(infos)
@@ -55,7 +93,12 @@ class BaseModel:
         return self.__str__()
 
 
+class DictModel(BaseModel):
+    """基于 __dict__ 存储任意字段的模型, 用于 from_json 还原嵌套对象"""
+
+
 class OkxBaseModel(BaseModel):
+    __slots__ = ("_pair",)
 
     def __init__(self, _pair):
         self._pair = _pair
@@ -64,7 +107,7 @@ class OkxBaseModel(BaseModel):
     def pair(self):
         if self._pair is None:
             raise ValueError("Pair is not set")
-        return self._pair.replace("-SWAP", "").replace("-", "")
+        return okx_inst_id_to_pair(self._pair)
 
 
 class HyperLiquidBaseModel(BaseModel):
@@ -8,8 +8,9 @@
 """
 import datetime
 import time
+from operator import itemgetter
 
-from cex_tools.exchange_model.base_model import BaseModel
+from cex_tools.exchange_model.base_model import BaseModel, okx_inst_id_to_pair, get_float
 from cex_tools.cex_enum import TradeSide
 
 
@@ -51,7 +52,7 @@ class OkxOrder(BaseOrderModel):
 
     def __init__(self, order_info):
         self.orderId = order_info['ordId']  # 30125120004,
-        self.symbol = order_info['instId'].replace("-SWAP", "").replace("-", "")  # 'LINKUSDT',
+        self.symbol = okx_inst_id_to_pair(order_info['instId'])  # 'LINKUSDT',
         self.pair = self.symbol
         if order_info['state'] == "canceled":
             self.status = BinanceOrderStatus.CANCELED
@@ -64,19 +65,21 @@ class OkxOrder(BaseOrderModel):
         elif order_info['state'] == "mmp_canceled":
             self.status = BinanceOrderStatus.CANCELED  # 做市商保护的撤单
         self.clientOrderId = order_info['clOrdId']  # 'p27cmg6ima2fOmUzb1wVGb',
-        self.price = float(order_info['px']) if order_info['px'] else 0  # '15.275',
-        self.avgPrice = float(order_info['avgPx']) if order_info['avgPx'] else 0  # '15.27500',
+        self.price = get_float(order_info, 'px')  # '15.275',
+        self.avgPrice = get_float(order_info, 'avgPx')  # '15.27500',
         # ⚠️ 合约张数 数值需要转换
-        self.origQty = float(order_info['sz']) if order_info['sz'] else 0  # '654.88',
-        self.executedQty = float(order_info['accFillSz']) if order_info['accFillSz'] else 0  # '654.88', accFillSz?
-        self.cumQuote = self.avgPrice * self.executedQty  # '10003.29200',
+        self.origQty = get_float(order_info, 'sz')  # '654.88',
+        self.executedQty = get_float(order_info, 'accFillSz')  # '654.88', accFillSz?
+        # 优先使用交易所返回的成交名义价值, 缺失时再用均价*数量估算
+        fill_notional = order_info.get('fillNotionalUsd')
+        self.cumQuote = float(fill_notional) if fill_notional else self.avgPrice * self.executedQty  # '10003.29200',
         self.timeInForce = ""  # 'GTC',
         self.type = order_info['ordType'].upper()  # 'LIMIT',
         self.reduceOnly = order_info['reduceOnly'] == 'true'  # False,
         self.closePosition = ""  # False,
         self.side = order_info['side'].upper()  # 'BUY',
         self.positionSide = order_info['posSide']  # 'net',
-        self.stopPrice = float(order_info['slOrdPx']) if order_info['slOrdPx'] else 0  # '0',
+        self.stopPrice = get_float(order_info, 'slOrdPx')  # '0',
         self.workingType = ""  # 'CONTRACT_PRICE',
         self.priceMatch = ""  # 'NONE',
         self.selfTradePreventionMode = ""  # 'NONE',
@@ -88,34 +91,50 @@ class OkxOrder(BaseOrderModel):
         self.updateTime = int(order_info['uTime'] if order_info['uTime'] else 0)  # 1705372661393
 
 
+# 预先构建的字段提取器, 一次 C 层调用取出 BinanceOrder 需要的全部字段
+_binance_order_fields = itemgetter(
+    'orderId', 'symbol', 'status', 'clientOrderId', 'price', 'avgPrice', 'origQty', 'executedQty', 'cumQuote',
+    'timeInForce', 'type', 'reduceOnly', 'closePosition', 'side', 'positionSide', 'stopPrice', 'workingType',
+    'priceMatch', 'selfTradePreventionMode', 'goodTillDate', 'priceProtect', 'origType', 'time', 'updateTime')
+
+
 class BinanceOrder(BaseOrderModel):
 
     def __init__(self, order_info):
-        self.orderId = order_info['orderId']  # 30125120004,
-        self.symbol = order_info['symbol']  # 'LINKUSDT',
+        (self.orderId,  # 30125120004,
+         self.symbol,  # 'LINKUSDT',
+         self.status,  # 'FILLED',
+         self.clientOrderId,  # 'p27cmg6ima2fOmUzb1wVGb',
+         price,  # '15.275',
+         avg_price,  # '15.27500',
+         orig_qty,  # '654.88',
+         executed_qty,  # '654.88',
+         cum_quote,  # '10003.29200',
+         self.timeInForce,  # 'GTC',
+         self.type,  # 'LIMIT',
+         self.reduceOnly,  # False,
+         self.closePosition,  # False,
+         self.side,  # 'BUY',
+         self.positionSide,  # 'BOTH',
+         stop_price,  # '0',
+         self.workingType,  # 'CONTRACT_PRICE',
+         self.priceMatch,  # 'NONE',
+         self.selfTradePreventionMode,  # 'NONE',
+         self.goodTillDate,  # 0,
+         self.priceProtect,  # False,
+         self.origType,  # 'LIMIT',
+         create_time,  # 1705372648922,
+         update_time,  # 1705372661393
+         ) = _binance_order_fields(order_info)
         self.pair = self.symbol
-        self.status = order_info['status']  # 'FILLED',
-        self.clientOrderId = order_info['clientOrderId']  # 'p27cmg6ima2fOmUzb1wVGb',
-        self.price = float(order_info['price']) if order_info['price'] else 0  # '15.275',
-        self.avgPrice = float(order_info['avgPrice']) if order_info['avgPrice'] else 0  # '15.27500',
-        self.origQty = float(order_info['origQty']) if order_info['origQty'] else 0  # '654.88',
-        self.executedQty = float(order_info['executedQty']) if order_info['executedQty'] else 0  # '654.88',
-        self.cumQuote = float(order_info['cumQuote']) if order_info['cumQuote'] else 0  # '10003.29200',
-        self.timeInForce = order_info['timeInForce']  # 'GTC',
-        self.type = order_info['type']  # 'LIMIT',
-        self.reduceOnly = order_info['reduceOnly']  # False,
-        self.closePosition = order_info['closePosition']  # False,
-        self.side = order_info['side']  # 'BUY',
-        self.positionSide = order_info['positionSide']  # 'BOTH',
-        self.stopPrice = float(order_info['stopPrice']) if order_info['stopPrice'] else 0  # '0',
-        self.workingType = order_info['workingType']  # 'CONTRACT_PRICE',
-        self.priceMatch = order_info['priceMatch']  # 'NONE',
-        self.selfTradePreventionMode = order_info['selfTradePreventionMode']  # 'NONE',
-        self.goodTillDate = order_info['goodTillDate']  # 0,
-        self.priceProtect = order_info['priceProtect']  # False,
-        self.origType = order_info['origType']  # 'LIMIT',
-        self.time = int(order_info['time'])  # 1705372648922,
-        self.updateTime = int(order_info['updateTime'])  # 1705372661393
+        self.price = float(price) if price else 0
+        self.avgPrice = float(avg_price) if avg_price else 0
+        self.origQty = float(orig_qty) if orig_qty else 0
+        self.executedQty = float(executed_qty) if executed_qty else 0
+        self.cumQuote = float(cum_quote) if cum_quote else 0
+        self.stopPrice = float(stop_price) if stop_price else 0
+        self.time = int(create_time)
+        self.updateTime = int(update_time)
 
 
 class HyperLiquidOrder(BaseOrderModel):
@@ -126,10 +145,11 @@ class HyperLiquidOrder(BaseOrderModel):
         self.pair = self.symbol
         self.status = None  # 'FILLED',
         self.clientOrderId = None  # 'p27cmg6ima2fOmUzb1wVGb',
-        self.price = float(order_info['limitPx']) if order_info.get('limitPx') else 0  # '15.275',
-        self.avgPrice = float(order_info['limitPx']) if order_info.get('limitPx') else 0
-        self.origQty = float(order_info['origSz']) if order_info.get('origSz') else 0  # '654.88',
-        self.executedQty = self.origQty - float(order_info['sz']) if order_info.get('sz') else 0  # '654.88',
+        self.price = get_float(order_info, 'limitPx')  # '15.275',
+        self.avgPrice = self.price
+        self.origQty = get_float(order_info, 'origSz')  # '654.88',
+        sz = order_info.get('sz')
+        self.executedQty = self.origQty - float(sz) if sz else 0  # '654.88',
         self.cumQuote = None
         self.timeInForce = None
         self.type = order_info.get("orderType", "").upper()
@@ -164,35 +184,37 @@ class HyperLiquidOrder(BaseOrderModel):
 class LighterOrder(BaseOrderModel):
 
     def __init__(self, order_info):
-        order_info = order_info.to_dict()
-        self.orderId = order_info['order_id']  # 30125120004,
-        self.symbol = order_info['market_index']  # 'LINKUSDT',
+        # 直接读取 SDK 对象属性, 避免 to_dict() 复制整个对象
+        self.orderId = order_info.order_id  # 30125120004,
+        self.symbol = order_info.market_index  # 'LINKUSDT',
         self.pair = self.symbol
-        self.status = order_info['status'].upper()  # 'FILLED',
-        self.clientOrderId = order_info['client_order_id']  # 'p27cmg6ima2fOmUzb1wVGb',
-        self.price = float(order_info['price']) if order_info['price'] else 0  # '15.275',
-        if float(order_info['filled_base_amount']) == 0:
+        self.status = order_info.status.upper()  # 'FILLED',
+        self.clientOrderId = order_info.client_order_id  # 'p27cmg6ima2fOmUzb1wVGb',
+        self.price = float(v) if (v := order_info.price) else 0  # '15.275',
+        filled_base_amount = order_info.filled_base_amount
+        filled_quote_amount = order_info.filled_quote_amount
+        self.executedQty = float(filled_base_amount) if filled_base_amount else 0  # '654.88',
+        self.cumQuote = float(filled_quote_amount) if filled_quote_amount else 0  # '10003.29200',
+        if self.executedQty == 0:
             self.avgPrice = 0
         else:
-            self.avgPrice = float(order_info["filled_quote_amount"]) / float(order_info['filled_base_amount'])
-        self.origQty = float(order_info['initial_base_amount']) if order_info['initial_base_amount'] else 0  # '654.88',
-        self.executedQty = float(order_info['filled_base_amount']) if order_info['filled_base_amount'] else 0  # '654.88',
-        self.cumQuote = float(order_info['filled_quote_amount']) if order_info['filled_quote_amount'] else 0  # '10003.29200',
-        self.timeInForce = order_info['time_in_force']  # "immediate-or-cancel",
-        self.type = order_info['type'].upper()  # 'LIMIT',
-        self.reduceOnly = order_info['reduce_only']  # False,
+            self.avgPrice = self.cumQuote / self.executedQty
+        self.origQty = float(v) if (v := order_info.initial_base_amount) else 0  # '654.88',
+        self.timeInForce = order_info.time_in_force  # "immediate-or-cancel",
+        self.type = order_info.type.upper()  # 'LIMIT',
+        self.reduceOnly = order_info.reduce_only  # False,
         # self.closePosition = order_info['closePosition']  # False,
-        self.side = "SELL" if order_info["is_ask"] else "BUY"  # 'BUY',
+        self.side = "SELL" if order_info.is_ask else "BUY"  # 'BUY',
         # self.positionSide = order_info['positionSide']  # 'BOTH',
-        self.stopPrice = float(order_info['trigger_price']) if order_info['trigger_price'] else 0  # '0',
+        self.stopPrice = float(v) if (v := order_info.trigger_price) else 0  # '0',
         # self.workingType = order_info['workingType']  # 'CONTRACT_PRICE',
         # self.priceMatch = order_info['priceMatch']  # 'NONE',
         # self.selfTradePreventionMode = order_info['selfTradePreventionMode']  # 'NONE',
         # self.goodTillDate = order_info['goodTillDate']  # 0,
         # self.priceProtect = order_info['priceProtect']  # False,
         self.origType = self.type  # 'LIMIT',
-        self.time = int(order_info['created_at'] * 1000)  # 1705372648922, # 1758433998
-        self.updateTime = int(order_info['updated_at'] * 1000)  # 1705372661393
+        self.time = int(order_info.created_at * 1000)  # 1705372648922, # 1758433998
+        self.updateTime = int(order_info.updated_at * 1000)  # 1705372661393
 
 
 class BinanceUnifiedOrder(BaseOrderModel):
@@ -256,18 +278,18 @@ class BybitOrder(BaseOrderModel):
         self.pair = self.symbol
         self.status = order_info.get('orderStatus')  # 订单状态
         self.clientOrderId = order_info.get('orderLinkId')  # 客户端订单ID
-        self.price = float(order_info.get('price', 0)) if order_info.get('price') else 0  # 价格
-        self.avgPrice = float(order_info.get('avgPrice', 0)) if order_info.get('avgPrice') else 0  # 平均价格
-        self.origQty = float(order_info.get('qty', 0)) if order_info.get('qty') else 0  # 原始数量
-        self.executedQty = float(order_info.get('cumExecQty', 0)) if order_info.get('cumExecQty') else 0  # 已执行数量
-        self.cumQuote = float(order_info.get('cumExecValue', 0)) if order_info.get('cumExecValue') else 0  # 累计成交金额
+        self.price = float(v) if (v := order_info.get('price')) else 0  # 价格
+        self.avgPrice = float(v) if (v := order_info.get('avgPrice')) else 0  # 平均价格
+        self.origQty = float(v) if (v := order_info.get('qty')) else 0  # 原始数量
+        self.executedQty = float(v) if (v := order_info.get('cumExecQty')) else 0  # 已执行数量
+        self.cumQuote = float(v) if (v := order_info.get('cumExecValue')) else 0  # 累计成交金额
         self.timeInForce = order_info.get('timeInForce')  # 时效性
         self.type = order_info.get('orderType')  # 订单类型
         self.reduceOnly = order_info.get('reduceOnly', False)  # 只减仓
         self.closePosition = order_info.get('closeOnTrigger', False)  # 触发平仓
         self.side = order_info.get('side')  # 买卖方向
         self.positionSide = order_info.get('positionSide')  # 持仓方向
-        self.stopPrice = float(order_info.get('triggerPrice', 0)) if order_info.get('triggerPrice') else 0  # 触发价格
+        self.stopPrice = float(v) if (v := order_info.get('triggerPrice')) else 0  # 触发价格
         self.workingType = order_info.get('triggerBy')  # 触发类型
         self.priceMatch = order_info.get('priceMatch')  # 价格匹配
         self.selfTradePreventionMode = order_info.get('stpMode')  # 自成交预防模式
@@ -36,6 +36,10 @@ class OrderStatusType:
 
 class OrderUpdateEvent:
     """订单更新时间模型"""
+    __slots__ = ("exchange_code", "symbol", "client_order_id", "side", "order_type", "original_quantity", "price",
+                 "avg_price", "order_status", "order_id", "trade_id", "order_last_filled_quantity",
+                 "order_filled_accumulated_quantity", "last_filled_price", "reduce_only", "position_side_mode",
+                 "timestamp")
 
     def __init__(self,
                  exchange_code: str,
@@ -8,6 +8,20 @@
 """
 import time
 
+import numpy as np
+
+from cex_tools.exchange_model.base_model import okx_inst_id_to_pair
+
+
+def parse_levels(levels, width=2):
+    """
+    将 [[px, qty, ...], ...] 格式的档位一次性解析为 float64 二维数组
+    numpy 在 C 层完成 str -> float 转换, 避免逐档构造 Python 对象
+    """
+    if not levels:
+        return np.empty((0, width), dtype=np.float64)
+    return np.array(levels, dtype=np.float64)
+
 
 class BinanceOrderBook:
     class OrderBookItems:
@@ -27,11 +41,36 @@ class BinanceOrderBook:
 
     def __init__(self, order_book_res, _pair=None):
         self._pair = _pair
-        self.asks = [self.OrderBookItems(d) for d in order_book_res["asks"]]
-        self.bids = [self.OrderBookItems(d) for d in order_book_res["bids"]]
-        self.mid_price = (self.asks[0].price + self.bids[0].price) / 2
+        self._set_levels(parse_levels(order_book_res["asks"]), parse_levels(order_book_res["bids"]))
+        self.mid_price = float(self.ask_px[0] + self.bid_px[0]) / 2
         self.time = None
 
+    def _set_levels(self, ask_levels, bid_levels):
+        """
+        保存档位数组, 价格/数量列为 ask_levels/bid_levels 的视图
+        asks/bids 的 OrderBookItems 列表只在被访问时才构造
+        """
+        self.ask_levels = ask_levels
+        self.bid_levels = bid_levels
+        self.ask_px = ask_levels[:, 0]
+        self.ask_qty = ask_levels[:, 1]
+        self.bid_px = bid_levels[:, 0]
+        self.bid_qty = bid_levels[:, 1]
+        self._asks = None
+        self._bids = None
+
+    @property
+    def asks(self):
+        if self._asks is None:
+            self._asks = [self.OrderBookItems(d) for d in self.ask_levels]
+        return self._asks
+
+    @property
+    def bids(self):
+        if self._bids is None:
+            self._bids = [self.OrderBookItems(d) for d in self.bid_levels]
+        return self._bids
+
     @property
     def pair(self):
         return self._pair
@@ -40,10 +79,10 @@ class BinanceOrderBook:
         return self.mid_price
 
     def get_sell_price_by_level(self, level=0):
-        return self.asks[level].price
+        return float(self.ask_px[level])
 
     def get_buy_price_by_level(self, level=0):
-        return self.bids[level].price
+        return float(self.bid_px[level])
 
     def get_sell_price_vwap(self):
         """
@@ -52,8 +91,8 @@ class BinanceOrderBook:
         - 价格离一档有距离
         :return:
         """
-        ask_volume = sum([x.quantity * x.price for x in self.asks[1:]])
-        ask_quantity = sum([x.quantity for x in self.asks[1:]])
+        ask_volume = float(np.dot(self.ask_px[1:], self.ask_qty[1:]))
+        ask_quantity = float(self.ask_qty[1:].sum())
         # ask_count = sum([x.order_count for x in self.asks])
         ask_vwap = ask_volume / ask_quantity if ask_quantity != 0 else 0
         return ask_vwap
@@ -65,8 +104,8 @@ class BinanceOrderBook:
         - 价格离一档有距离
         :return:
         """
-        bid_volume = sum([x.quantity * x.price for x in self.bids[1:]])
-        bid_quantity = sum([x.quantity for x in self.bids[1:]])
+        bid_volume = float(np.dot(self.bid_px[1:], self.bid_qty[1:]))
+        bid_quantity = float(self.bid_qty[1:].sum())
         # bid_count = sum([x.order_count for x in self.bids])
         bid_vwap = bid_volume / bid_quantity if bid_quantity != 0 else 0
         return bid_vwap
@@ -88,29 +127,38 @@ class OkxOrderBook(BinanceOrderBook):
         BinanceOrderBook.__init__(self, order_book_res)
         self.time = int(order_book_res["ts"])
         self._pair = _pair
+        self._cached_pair = okx_inst_id_to_pair(_pair) if _pair else None
 
     @property
     def pair(self):
-        if self._pair is None:
+        if self._cached_pair is None:
             raise ValueError("Pair is not set")
-        return self._pair.replace("-SWAP", "").replace("-", "")
+        return self._cached_pair
 
 
 class HyperLiquidOrderBook(BinanceOrderBook):
     class OrderBookItems(BinanceOrderBook.OrderBookItems):
         def __init__(self, item_data):
-            self.price = float(item_data["px"])
-            self.quantity = float(item_data["sz"])
-            self.order_count = int(item_data["n"])
+            self.price = float(item_data[0])
+            self.quantity = float(item_data[1])
+            self.order_count = int(item_data[2])
 
     def __init__(self, data):
         self._pair = data["coin"] + "USDT"
         levels = data["levels"]
-        self.asks = [self.OrderBookItems(d) for d in levels[1]]
-        self.bids = [self.OrderBookItems(d) for d in levels[0]]
-        self.mid_price = (self.asks[0].price + self.bids[0].price) / 2
+        self._set_levels(self._parse_hyperliquid_levels(levels[1]),
+                         self._parse_hyperliquid_levels(levels[0]))
+        self.mid_price = float(self.ask_px[0] + self.bid_px[0]) / 2
         self.time = data["time"]
 
+    @staticmethod
+    def _parse_hyperliquid_levels(levels):
+        """HyperLiquid 档位为 {"px", "sz", "n"} 字典, 按 (px, sz, n) 列解析"""
+        if not levels:
+            return np.empty((0, 3), dtype=np.float64)
+        return np.fromiter((v for d in levels for v in (d["px"], d["sz"], d["n"])),
+                           dtype=np.float64, count=len(levels) * 3).reshape(-1, 3)
+
 
 class BybitOrderBook(BinanceOrderBook):
     class OrderBookItems(BinanceOrderBook.OrderBookItems):
@@ -120,10 +168,9 @@ class BybitOrderBook(BinanceOrderBook):
 
     def __init__(self, order_book_res, _pair=None):
         self._pair = _pair
-        self.bids = [self.OrderBookItems(d) for d in order_book_res.get("b", [])]
-        self.asks = [self.OrderBookItems(d) for d in order_book_res.get("a", [])]
-        if self.bids and self.asks:
-            self.mid_price = (self.asks[0].price + self.bids[0].price) / 2
+        self._set_levels(parse_levels(order_book_res.get("a", [])), parse_levels(order_book_res.get("b", [])))
+        if len(self.bid_px) and len(self.ask_px):
+            self.mid_price = float(self.ask_px[0] + self.bid_px[0]) / 2
         else:
             self.mid_price = 0
         self.time = int(order_book_res.get("ts", 0))
@@ -131,3 +178,54 @@ class BybitOrderBook(BinanceOrderBook):
     @property
     def pair(self):
         return self._pair
+
+
+class BatchOrderBookView:
+    """
+    多个订单簿的批量视图
+    将各订单簿的价格/数量列堆叠为 (订单簿数量, 档位深度) 的二维数组,
+    一次 numpy 调用即可得到所有订单簿的中间价/VWAP, 档位不足的部分以 0 补齐
+    """
+
+    def __init__(self, books):
+        self.books = list(books)
+        self.pairs = [book.pair for book in self.books]
+        self.ask_px, self.ask_qty = self._stack([book.ask_px for book in self.books],
+                                                [book.ask_qty for book in self.books])
+        self.bid_px, self.bid_qty = self._stack([book.bid_px for book in self.books],
+                                                [book.bid_qty for book in self.books])
+
+    @staticmethod
+    def _stack(px_columns, qty_columns):
+        depth = max((len(col) for col in px_columns), default=0)
+        px = np.zeros((len(px_columns), depth), dtype=np.float64)
+        qty = np.zeros((len(qty_columns), depth), dtype=np.float64)
+        for i, (px_col, qty_col) in enumerate(zip(px_columns, qty_columns)):
+            px[i, :len(px_col)] = px_col
+            qty[i, :len(qty_col)] = qty_col
+        return px, qty
+
+    @staticmethod
+    def _vwap(px, qty):
+        volume = (px * qty).sum(axis=1)
+        quantity = qty.sum(axis=1)
+        return np.divide(volume, quantity, out=np.zeros_like(volume), where=quantity != 0)
+
+    def get_mid_prices(self):
+        """各订单簿中间价, 任一侧为空时为 0"""
+        if self.ask_px.shape[1] == 0 or self.bid_px.shape[1] == 0:
+            return np.zeros(len(self.books), dtype=np.float64)
+        has_both = (self.ask_qty[:, 0] > 0) & (self.bid_qty[:, 0] > 0)
+        return np.where(has_both, (self.ask_px[:, 0] + self.bid_px[:, 0]) / 2, 0.0)
+
+    def get_sell_price_vwap(self):
+        """与 BinanceOrderBook.get_sell_price_vwap 相同, 跳过第一档, 返回各订单簿的结果向量"""
+        return self._vwap(self.ask_px[:, 1:], self.ask_qty[:, 1:])
+
+    def get_buy_price_vwap(self):
+        """与 BinanceOrderBook.get_buy_price_vwap 相同, 跳过第一档, 返回各订单簿的结果向量"""
+        return self._vwap(self.bid_px[:, 1:], self.bid_qty[:, 1:])
+
+    def to_dict(self, values):
+        """将结果向量按交易对展开为字典"""
+        return dict(zip(self.pairs, values.tolist()))
@@ -55,6 +55,8 @@ class PositionEvent:
 
         # 计算仓位变化
         self._calculate_changes()
+        # 预先读取仓位字段, 避免属性访问和 to_dict 时重复 getattr
+        self._cache_position_fields()
 
     def _calculate_changes(self):
         """计算仓位变化"""
@@ -70,78 +72,85 @@ class PositionEvent:
             self.size_change = 0
             self.pnl_change = 0
 
+    def _cache_position_fields(self):
+        """一次性读取仓位详情字段"""
+        pd = self.position_detail
+        if pd:
+            self._position_size = getattr(pd, 'positionAmt', 0)
+            self._unrealized_pnl = getattr(pd, 'unRealizedProfit', 0)
+            side = getattr(pd, 'position_side', None)
+            # 仓位模型中为 "BUY"/"SELL" 字符串, 兼容枚举取值
+            self._position_side = getattr(side, 'value', side) if side else None
+            self._entry_price = getattr(pd, 'entryPrice', None)
+            self._mark_price = getattr(pd, 'markPrice', None)
+            self._notional_value = getattr(pd, 'notional', 0)
+            self._leverage = getattr(pd, 'leverage', None)
+        else:
+            self._position_size = 0
+            self._unrealized_pnl = 0
+            self._position_side = None
+            self._entry_price = None
+            self._mark_price = None
+            self._notional_value = 0
+            self._leverage = None
+
     @property
     def position_size(self) -> float:
         """当前仓位大小"""
-        if self.position_detail:
-            return getattr(self.position_detail, 'positionAmt', 0)
-        return 0
+        return self._position_size
 
     @property
     def unrealized_pnl(self) -> float:
         """当前未实现盈亏"""
-        if self.position_detail:
-            return getattr(self.position_detail, 'unRealizedProfit', 0)
-        return 0
+        return self._unrealized_pnl
 
     @property
     def position_side(self) -> Optional[str]:
         """仓位方向"""
-        if self.position_detail:
-            side = getattr(self.position_detail, 'position_side', None)
-            if side:
-                return side.value
-        return None
+        return self._position_side
 
     @property
     def entry_price(self) -> Optional[float]:
         """入场价格"""
-        if self.position_detail:
-            return getattr(self.position_detail, 'entryPrice', None)
-        return None
+        return self._entry_price
 
     @property
     def mark_price(self) -> Optional[float]:
         """标记价格"""
-        if self.position_detail:
-            return getattr(self.position_detail, 'markPrice', None)
-        return None
+        return self._mark_price
 
     @property
     def notional_value(self) -> float:
         """名义价值"""
-        if self.position_detail:
-            return getattr(self.position_detail, 'notional', 0)
-        return 0
+        return self._notional_value
 
     @property
     def leverage(self) -> Optional[float]:
         """杠杆倍数"""
-        if self.position_detail:
-            return getattr(self.position_detail, 'leverage', None)
-        return None
+        return self._leverage
 
     def is_open_position(self) -> bool:
         """是否为开仓状态"""
-        return self.position_size != 0
+        return self._position_size != 0
 
     def is_long_position(self) -> bool:
         """是否为多头仓位"""
-        return self.position_size > 0
+        return self._position_size > 0
 
     def is_short_position(self) -> bool:
         """是否为空头仓位"""
-        return self.position_size < 0
+        return self._position_size < 0
 
     def get_position_summary(self) -> str:
         """获取仓位摘要信息"""
-        if not self.is_open_position():
+        size = self._position_size
+        if size == 0:
             return f"{self.symbol}: 无仓位"
 
-        side = "多头" if self.is_long_position() else "空头"
-        return (f"{self.symbol} {side} {abs(self.position_size):.4f} "
-                f"入场价: {self.entry_price} "
-                f"盈亏: {self.unrealized_pnl:.4f}")
+        side = "多头" if size > 0 else "空头"
+        return (f"{self.symbol} {side} {abs(size):.4f} "
+                f"入场价: {self._entry_price} "
+                f"盈亏: {self._unrealized_pnl:.4f}")
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -150,13 +159,13 @@ class PositionEvent:
             'symbol': self.symbol,
             'event_type': self.event_type.value,
             'timestamp': self.timestamp,
-            'position_size': self.position_size,
-            'position_side': self.position_side,
-            'entry_price': self.entry_price,
-            'mark_price': self.mark_price,
-            'unrealized_pnl': self.unrealized_pnl,
-            'notional_value': self.notional_value,
-            'leverage': self.leverage,
+            'position_size': self._position_size,
+            'position_side': self._position_side,
+            'entry_price': self._entry_price,
+            'mark_price': self._mark_price,
+            'unrealized_pnl': self._unrealized_pnl,
+            'notional_value': self._notional_value,
+            'leverage': self._leverage,
             'size_change': self.size_change,
             'pnl_change': self.pnl_change
         }
@@ -6,176 +6,277 @@
 @Description :
 @Time        : 2024/9/26 12:45
 """
-from cex_tools.exchange_model.base_model import BaseModel, TradeDirection
+import sys
+from math import copysign
+from operator import itemgetter
+
+import numpy as np
+
+from cex_tools.cex_enum import ExchangeEnum
+from cex_tools.exchange_model.base_model import BaseModel, TradeDirection, okx_inst_id_to_pair, pair_to_symbol, \
+    symbol_to_pair
+
+
+# 模块级常量, 避免每次构造仓位时查找类属性
+_LONG = TradeDirection.long
+_SHORT = TradeDirection.short
+
+
+# 空字典的 get, 填充空仓位时所有字段都取缺省值
+_EMPTY_GET = {}.get
+
+
+def _raw(v):
+    return v
+
+
+def _compile_populate(spec, slots=()):
+    """
+    根据字段映射表生成专用的填充函数 populate(obj, get), 每个字段只读取一次
+    spec: ((属性名, 数据字段名, 转换函数, 缺省值), ...), 字段值为空时使用缺省值
+    slots: 类的全部属性槽, 不在映射表中的先置为 None, 保证任何交易所的仓位都不会缺少属性
+    生成的函数是逐字段展开的直线代码, 没有遍历映射表和 setattr 的解释开销
+    转换函数和缺省值作为参数默认值绑定为局部变量, 读取时走 LOAD_FAST 而不是 LOAD_GLOBAL
+    """
+    namespace = {}
+    params = []
+    body = []
+    mapped = {attr for attr, _, _, _ in spec}
+    for name in slots:
+        if name not in mapped:
+            body.append(f"    obj.{name} = None")
+    for i, (attr, key, conv, default) in enumerate(spec):
+        namespace[f"_default{i}"] = default
+        params.append(f"_default{i}=_default{i}")
+        body.append(f"    v = get({key!r})")
+        if conv is _raw:
+            body.append(f"    obj.{attr} = v if v else _default{i}")
+        else:
+            namespace[f"_conv{i}"] = conv
+            params.append(f"_conv{i}=_conv{i}")
+            body.append(f"    obj.{attr} = _conv{i}(v) if v else _default{i}")
+    if not body:
+        body.append("    pass")
+    exec("\n".join([f"def populate({', '.join(['obj', 'get'] + params)}):"] + body), namespace)
+    return namespace["populate"]
+
+
+_POSITION_STR_TEMPLATE = ("Position(symbol={p.symbol}, side={p.position_side}, "
+                          "size={p.positionAmt}, entry_price={p.entryPrice}, "
+                          "pnl={p.unRealizedProfit:.2f}, "
+                          "pnl_rate={p.profit_rate:.4%})")
 
 
 class BinancePositionDetail(BaseModel):
+    __slots__ = ("exchange_code", "adl", "entryPrice", "breakEvenPrice", "marginType", "isAutoAddMargin",
+                 "isolatedMargin", "liquidationPrice", "fundingFee", "markPrice", "positionAmt", "notional",
+                 "isolatedWallet", "pair", "symbol", "unRealizedProfit", "positionSide", "updateTime",
+                 "position_side", "is_long", "funding_rate", "profit_rate", "leverage", "maxNotionalValue")
+    _FIELD_MAP = (
+        ("adl", "adl", int, 0),  # 1~5
+        ("entryPrice", "entryPrice", float, 0),  # "0.00000",
+        ("breakEvenPrice", "breakEvenPrice", float, 0),  # "0.0",
+        ("marginType", "marginType", _raw, None),  # "isolated",
+        ("isAutoAddMargin", "isAutoAddMargin", _raw, None),  # "false",
+        ("isolatedMargin", "isolatedMargin", float, 0),  # "0.00000000",
+        ("liquidationPrice", "liquidationPrice", float, 0),  # "0",
+        ("markPrice", "markPrice", float, 0),  # "6679.50671178",
+        ("positionAmt", "positionAmt", float, 0),  # "0.000",
+        ("notional", "notional", float, 0),  # "0", ,
+        ("isolatedWallet", "isolatedWallet", float, 0),  # "0",
+        ("pair", "symbol", _raw, None),  # "BTCUSDT",
+        ("unRealizedProfit", "unRealizedProfit", float, 0),  # "0.00000000",
+        ("positionSide", "positionSide", _raw, None),  # "BOTH",
+        ("updateTime", "updateTime", float, 0),  # 0
+    )
 
     def __init__(self, binance_position, exchange_code=None):
         self.exchange_code = exchange_code
-        self.adl = int(binance_position.get("adl") or 0)  # 1~5
-        self.entryPrice = float(binance_position.get("entryPrice"))  # "0.00000",
-        self.breakEvenPrice = float(binance_position.get("breakEvenPrice", 0))  # "0.0",
-        self.marginType = binance_position.get("marginType")  # "isolated",
-        self.isAutoAddMargin = binance_position.get("isAutoAddMargin")  # "false",
-        self.isolatedMargin = float(binance_position.get("isolatedMargin", 0))  # "0.00000000",
-        # self.leverage = float(binance_position.get("leverage"))  # "10",
-        self.liquidationPrice = float(binance_position.get("liquidationPrice"))  # "0",
+        self._populate(self, binance_position.get)
         self.fundingFee = 0
-        self.markPrice = float(binance_position.get("markPrice"))  # "6679.50671178",
-        # self.maxNotionalValue = float(binance_position.get("maxNotionalValue"))  # "20000000",
-        self.positionAmt = float(binance_position.get("positionAmt"))  # "0.000",
-        self.notional = float(binance_position.get("notional"))  # "0", ,
-        self.isolatedWallet = float(binance_position.get("isolatedWallet", 0))  # "0",
-        self.pair = binance_position.get("symbol")  # "BTCUSDT",
-        self.symbol = self.pair.replace("USDT", "")
-        self.unRealizedProfit = float(binance_position.get("unRealizedProfit"))  # "0.00000000",
-        self.positionSide = binance_position.get("positionSide")  # "BOTH",
-        self.updateTime = float(binance_position.get("updateTime"))  # 0
-        self.position_side = TradeDirection.long if self.positionAmt > 0 else TradeDirection.short
+        self.symbol = pair_to_symbol(self.pair)
+        self.position_side = _LONG if self.positionAmt > 0 else _SHORT
+        self.is_long = self.position_side == _LONG
         self.funding_rate = None
-
-    @property
-    def profit_rate(self):
-        if self.notional != 0:
-            return self.unRealizedProfit / abs(self.notional)
-        return 0
+        self.profit_rate = self._calc_profit_rate()
+
+    def _calc_profit_rate(self):
+        """收益率在构造时计算一次并保存为属性, unRealizedProfit/notional 构造后不再变化"""
+        notional = self.notional
+        if notional > 0:
+            return self.unRealizedProfit / notional
+        if notional < 0:
+            return -self.unRealizedProfit / notional
+        return 0.0
+
+    @classmethod
+    def empty(cls, exchange_code=None):
+        """
+        空仓位对象, 不经过 __init__ 解析原始数据 (各交易所的 __init__ 都依赖必填字段)
+        映射字段取缺省值, 其余属性置为 None, 数量与名义价值为 0
+        """
+        obj = cls.__new__(cls)
+        cls._populate(obj, _EMPTY_GET)
+        obj.exchange_code = exchange_code
+        obj.positionAmt = 0
+        obj.notional = 0
+        obj.fundingFee = 0
+        obj.is_long = False
+        obj.profit_rate = 0.0
+        return obj
 
     def set_funding_rate(self, funding_rate):
         self.funding_rate = funding_rate
 
+    @classmethod
+    def _build_populate(cls):
+        slots = [name for klass in reversed(cls.__mro__) for name in klass.__dict__.get("__slots__", ())]
+        cls._populate = staticmethod(_compile_populate(cls._FIELD_MAP, slots))
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._build_populate()
+
     def get_funding_rate(self):
         if self.funding_rate is None:
             return 0
         return self.funding_rate
 
     def __str__(self):
-        return (f"Position(symbol={self.symbol}, side={self.position_side}, "
-                f"size={self.positionAmt}, entry_price={self.entryPrice}, "
-                f"pnl={self.unRealizedProfit:.2f}, "
-                f"pnl_rate={self.profit_rate:.4%})")
+        return _POSITION_STR_TEMPLATE.format(p=self)
+
 
 
+BinancePositionDetail._build_populate()
+
 
 class OkxPositionDetail(BinancePositionDetail):
+    __slots__ = ("positionSheetAmt",)
+    _FIELD_MAP = (
+        ("adl", "adl", int, 1),  # 1~5
+        ("entryPrice", "avgPx", float, 0),  # "0.00000",
+        ("fundingFee", "fundingFee", float, 0),
+        ("liquidationPrice", "liqPx", float, 0),  # "0",
+        ("markPrice", "markPx", float, 0),  # "6679.50671178",
+        ("positionSheetAmt", "pos", float, 0),
+        ("positionAmt", "amt", float, 0),
+        ("notional", "notionalUsd", float, 0),  # "0", ,
+        ("unRealizedProfit", "upl", float, 0),
+        ("updateTime", "uTime", float, 0),  # 0
+    )
 
     def __init__(self, binance_position, exchange_code=None):
         self.exchange_code = exchange_code
-        self.adl = int(binance_position.get("adl") or 1)  # 1~5
-        self.entryPrice = float(binance_position.get("avgPx")) if binance_position.get("avgPx") else 0  # "0.00000",
-        # self.breakEvenPrice = float(binance_position.get("breakEvenPrice"))  # "0.0",
-        # self.marginType = binance_position.get("marginType")  # "isolated",
-        # self.isAutoAddMargin = binance_position.get("isAutoAddMargin")  # "false",
-        # self.isolatedMargin = float(binance_position.get("isolatedMargin"))  # "0.00000000",
-        # self.leverage = float(binance_position.get("leverage"))  # "10",
-        self.fundingFee = float(binance_position.get("fundingFee")) if binance_position.get("fundingFee") else 0
-        self.liquidationPrice = float(binance_position.get("liqPx")) if binance_position.get("liqPx") else 0  # "0",
-        self.markPrice = float(binance_position.get("markPx")) if binance_position.get(
-            "markPx") else 0  # "6679.50671178",
-        # self.maxNotionalValue = float(binance_position.get("maxNotionalValue"))  # "20000000",
-        self.positionSheetAmt = float(binance_position.get("pos")) if binance_position.get("pos") else 0
-        self.positionAmt = float(binance_position.get("amt")) if binance_position.get("amt") else 0
-        self.notional = float(binance_position.get("notionalUsd")) if binance_position.get(
-            "notionalUsd") else 0  # "0", ,
+        get = binance_position.get
+        self._populate(self, get)
         self.notional *= -1 if self.positionAmt < 0 else 1
-        # self.isolatedWallet = float(binance_position.get("isolatedWallet"))  # "0",
-        self.pair = binance_position.get("instId").replace("SWAP", "").replace("-", "")
-        self.symbol = self.pair.replace("USDT", "")  # BTC-USDT-SWAP "BTCUSDT",
-        self.unRealizedProfit = float(binance_position.get("upl")) if binance_position.get("upl") else 0
-        # self.positionSide = binance_position.get("positionSide")  # "BOTH",
-        self.updateTime = float(binance_position.get("uTime")) if binance_position.get("uTime") else 0  # 0
+        self.pair = okx_inst_id_to_pair(get("instId"))
+        self.symbol = pair_to_symbol(self.pair)  # BTC-USDT-SWAP "BTCUSDT",
         if self.positionAmt > 0:
-            self.position_side = TradeDirection.long
+            self.position_side = _LONG
         elif self.positionAmt < 0:
-            self.position_side = TradeDirection.short
+            self.position_side = _SHORT
         else:
             self.position_side = None
+        self.is_long = self.position_side == _LONG
         self.funding_rate = None
+        self.profit_rate = self._calc_profit_rate()
 
 
 
 class BitgetPositionDetail(BinancePositionDetail):
+    __slots__ = ()
+    _FIELD_MAP = (
+        ("adl", "adl", int, 1),  # 1~5
+        ("breakEvenPrice", "breakEvenPrice", float, 0),  # "0.0",
+        ("marginType", "marginMode", _raw, None),  # "isolated",
+        ("leverage", "leverage", float, 0),  # "10",
+        ("liquidationPrice", "liquidationPrice", float, 0),  # "0",
+        ("markPrice", "markPrice", float, 0),  # "6679.50671178",
+        ("positionAmt", "positionAmt", float, 0),  # "0.000",
+        ("notional", "notional", float, 0),  # "0", ,
+        ("isolatedWallet", "isolatedWallet", float, 0),  # "0",
+        ("pair", "symbol", _raw, None),  # "BTCUSDT",
+        ("unRealizedProfit", "unRealizedProfit", float, 0),  # "0.00000000",
+        ("positionSide", "positionSide", _raw, None),  # "BOTH",
+        ("updateTime", "updateTime", float, 0),  # 0
+    )
 
     def __init__(self, binance_position, exchange_code=None):
         self.exchange_code = exchange_code
-        self.adl = int(binance_position.get("adl") or 1)  # 1~5
+        self._populate(self, binance_position.get)
         self.entryPrice = None  # "0.00000",
-        self.breakEvenPrice = float(binance_position.get("breakEvenPrice"))  # "0.0",
-        self.marginType = binance_position.get("marginMode")  # "isolated",
-        # self.isAutoAddMargin = binance_position.get("isAutoAddMargin")  # "false",
-        # self.isolatedMargin = float(binance_position.get("isolatedMargin"))  # "0.00000000",
-        self.leverage = float(binance_position.get("leverage"))  # "10",
-        self.liquidationPrice = float(binance_position.get("liquidationPrice"))  # "0",
         self.fundingFee = 0
-        self.markPrice = float(binance_position.get("markPrice"))  # "6679.50671178",
-        # self.maxNotionalValue = float(binance_position.get("maxNotionalValue"))  # "20000000",
-        self.positionAmt = float(binance_position.get("positionAmt"))  # "0.000",
-        self.notional = float(binance_position.get("notional"))  # "0", ,
-        self.isolatedWallet = float(binance_position.get("isolatedWallet"))  # "0",
-        self.pair = binance_position.get("symbol")
-        self.symbol = self.pair.replace("USDT", "")  # "BTCUSDT",
-        self.unRealizedProfit = float(binance_position.get("unRealizedProfit"))  # "0.00000000",
-        self.positionSide = binance_position.get("positionSide")  # "BOTH",
-        self.updateTime = float(binance_position.get("updateTime"))  # 0
-        self.position_side = TradeDirection.long if self.positionAmt > 0 else TradeDirection.short
+        self.symbol = pair_to_symbol(self.pair)  # "BTCUSDT",
+        self.position_side = _LONG if self.positionAmt > 0 else _SHORT
+        self.is_long = self.position_side == _LONG
         self.funding_rate = None
+        self.profit_rate = self._calc_profit_rate()
 
 
 
 class HyperliquidPositionDetail(BinancePositionDetail):
+    __slots__ = ()
+    _FIELD_MAP = (
+        ("adl", "adl", int, 1),  # 1~5
+        ("entryPrice", "entryPx", float, 0),  # "0.00000",
+        ("liquidationPrice", "liquidationPx", float, 0),  # "0",
+        ("positionAmt", "szi", float, 0),  # "0.000",
+        ("symbol", "coin", _raw, None),
+        ("unRealizedProfit", "unrealizedPnl", float, 0),  # "0.00000000",
+    )
 
     def __init__(self, binance_position, exchange_code=None):
         self.exchange_code = exchange_code
-        self.adl = int(binance_position.get("adl") or 1)  # 1~5
-        self.entryPrice = float(binance_position.get("entryPx"))  # "0.00000",
+        get = binance_position.get
+        _float = float
+        self._populate(self, get)
         self.breakEvenPrice = 0  # "0.0",
-        self.marginType = binance_position.get("leverage")["type"]  # "isolated",
+        leverage = get("leverage")
+        self.marginType = leverage["type"]  # "isolated",
         self.isAutoAddMargin = None  # "false",
         self.isolatedMargin = None  # "0.00000000",
-        self.leverage = float(binance_position.get("leverage")["value"])  # "10",
-        self.liquidationPrice = float(
-            binance_position.get("liquidationPx") if binance_position.get("liquidationPx") else 0)  # "0",
+        self.leverage = _float(leverage["value"])  # "10",
         # allTime, sinceOpen, sinceChange
-        self.fundingFee = -float(binance_position.get("cumFunding")["sinceOpen"])
+        self.fundingFee = -_float(get("cumFunding")["sinceOpen"])
         self.markPrice = None  # "6679.50671178",
         self.maxNotionalValue = None  # "20000000",
-        self.positionAmt = float(binance_position.get("szi"))  # "0.000",
-        self.notional = float(binance_position.get("positionValue")) * (
-                self.positionAmt / abs(self.positionAmt))  # "0", ,
+        # 名义价值符号与仓位方向一致, positionAmt 为 0 时不会除零
+        self.notional = copysign(_float(get("positionValue")), self.positionAmt)  # "0", ,
         self.isolatedWallet = None  # "0",
-        self.symbol = binance_position.get("coin")
-        self.pair = self.symbol + "USDT"
-        self.unRealizedProfit = float(binance_position.get("unrealizedPnl"))  # "0.00000000",
+        self.pair = symbol_to_pair(self.symbol)
         self.updateTime = None  # 0
-        self.position_side = TradeDirection.long if self.positionAmt > 0 else TradeDirection.short
+        self.position_side = _LONG if self.positionAmt > 0 else _SHORT
+        self.is_long = self.position_side == _LONG
         self.funding_rate = None
+        self.profit_rate = self._calc_profit_rate()
 
 
 
 class LighterPositionDetail(BinancePositionDetail):
+    __slots__ = ()
+    _FIELD_MAP = (
+        ("adl", "adl", int, 0),  # 1~5
+        ("entryPrice", "avg_entry_price", float, 0),  # "0.00000",
+        ("liquidationPrice", "liquidation_price", float, 0),  # "0",
+        ("symbol", "symbol", _raw, None),
+        ("unRealizedProfit", "unrealized_pnl", float, 0),  # "0.00000000",
+    )
 
     def __init__(self, binance_position, exchange_code=None):
         self.exchange_code = exchange_code
         binance_position = binance_position.to_dict()
-        self.adl = int(binance_position.get("adl") or 0)  # 1~5
-        self.entryPrice = float(binance_position.get("avg_entry_price"))  # "0.00000",
-        # self.breakEvenPrice = float(binance_position.get("breakEvenPrice"))  # "0.0",
-        # self.marginType = binance_position.get("marginType")  # "isolated",
-        # self.isAutoAddMargin = binance_position.get("isAutoAddMargin")  # "false",
-        # self.isolatedMargin = float(binance_position.get("isolatedMargin"))  # "0.00000000",
-        # self.leverage = float(binance_position.get("leverage"))  # "10",
-        self.liquidationPrice = float(binance_position.get("liquidation_price"))  # "0",
+        get = binance_position.get
+        self._populate(self, get)
         self.fundingFee = 0
-        # self.markPrice = float(binance_position.get("markPrice"))  # "6679.50671178",
-        # self.maxNotionalValue = float(binance_position.get("maxNotionalValue"))  # "20000000",
-        self.positionAmt = float(binance_position.get("position")) * binance_position.get("sign")  # "0.000",
-        self.notional = float(binance_position.get("position_value")) * binance_position.get("sign")  # "0", ,
-        # self.isolatedWallet = float(binance_position.get("isolatedWallet"))  # "0",
-        self.symbol = binance_position.get("symbol")
-        self.pair = self.symbol + "USDT"  # "BTCUSDT"
-        self.unRealizedProfit = float(binance_position.get("unrealized_pnl"))  # "0.00000000",
-        self.position_side = TradeDirection.long if self.positionAmt > 0 else TradeDirection.short
+        sign = get("sign")
+        self.positionAmt = float(get("position")) * sign  # "0.000",
+        self.notional = float(get("position_value")) * sign  # "0", ,
+        self.pair = symbol_to_pair(self.symbol)  # "BTCUSDT"
+        self.position_side = _LONG if self.positionAmt > 0 else _SHORT
+        self.is_long = self.position_side == _LONG
         self.funding_rate = None
+        self.profit_rate = self._calc_profit_rate()
 
 
 
@@ -184,6 +285,20 @@ class BinanceUnifiedPositionDetail(BinancePositionDetail):
     基于Binance Portfolio Margin SDK数据的仓位对象
     具有与BinancePositionDetail完全相同的属性，但直接从Portfolio Margin SDK数据对象中获取值
     """
+    __slots__ = ()
+    _FIELD_MAP = (
+        ("entryPrice", "entry_price", float, 0),
+        ("leverage", "leverage", float, 1),
+        ("liquidationPrice", "liquidation_price", float, 0),
+        ("markPrice", "mark_price", float, 0),
+        ("maxNotionalValue", "max_notional_value", float, 0),
+        ("positionAmt", "position_amt", float, 0),
+        ("notional", "notional", float, 0),
+        ("pair", "symbol", _raw, None),
+        ("unRealizedProfit", "un_realized_profit", float, 0),
+        ("positionSide", "position_side", _raw, None),
+        ("updateTime", "update_time", float, 0),
+    )
 
     def __init__(self, portfolio_margin_position_data, exchange_code=None):
         """
@@ -198,69 +313,167 @@ class BinanceUnifiedPositionDetail(BinancePositionDetail):
         # Portfolio Margin SDK字段映射到BinancePositionDetail标准字段
         # 根据注释中的数据格式: QueryUmPositionInformationResponse(entry_price='0.30923', leverage='5', mark_price='0.3092429', max_notional_value='6000000.0', position_amt='19.0', notional='5.8756151', symbol='TRXUSDT', un_realized_profit='0.0002451', liquidation_price='0', position_side='BOTH', update_time=1760718563795, additional_properties={})
 
+        self._populate(self, lambda k: getattr(portfolio_margin_position_data, k, None))
         self.adl = 0  # Portfolio Margin SDK可能没有这个字段，设为默认值
-        self.entryPrice = float(portfolio_margin_position_data.entry_price) if portfolio_margin_position_data.entry_price else 0
         self.breakEvenPrice = 0  # 默认值
         self.marginType = "cross"  # Portfolio Margin默认使用全仓
         self.isAutoAddMargin = "false"  # 默认值
         self.isolatedMargin = 0  # 默认值
-        self.leverage = float(portfolio_margin_position_data.leverage) if portfolio_margin_position_data.leverage else 1
-        self.liquidationPrice = float(portfolio_margin_position_data.liquidation_price) if portfolio_margin_position_data.liquidation_price else 0
         self.fundingFee = 0  # 默认值
-        self.markPrice = float(portfolio_margin_position_data.mark_price) if portfolio_margin_position_data.mark_price else 0
-        self.maxNotionalValue = float(portfolio_margin_position_data.max_notional_value) if portfolio_margin_position_data.max_notional_value else 0
-        self.positionAmt = float(portfolio_margin_position_data.position_amt) if portfolio_margin_position_data.position_amt else 0
-        self.notional = float(portfolio_margin_position_data.notional) if portfolio_margin_position_data.notional else 0
         self.isolatedWallet = 0  # 默认值
-        self.pair = portfolio_margin_position_data.symbol
-        self.symbol = self.pair.replace("USDT", "")
-        self.unRealizedProfit = float(portfolio_margin_position_data.un_realized_profit) if portfolio_margin_position_data.un_realized_profit else 0
-        self.positionSide = portfolio_margin_position_data.position_side
-        self.updateTime = float(portfolio_margin_position_data.update_time) if portfolio_margin_position_data.update_time else 0
+        self.symbol = pair_to_symbol(self.pair)
 
         # 确定仓位方向
         if self.positionAmt > 0:
-            self.position_side = TradeDirection.long
+            self.position_side = _LONG
         elif self.positionAmt < 0:
-            self.position_side = TradeDirection.short
+            self.position_side = _SHORT
         else:
             self.position_side = None
 
+        self.is_long = self.position_side == _LONG
         self.funding_rate = None
+        self.profit_rate = self._calc_profit_rate()
 
 
 class BybitPositionDetail(BinancePositionDetail):
     """Bybit持仓详情"""
+    __slots__ = ()
+
+    _FIELD_MAP = (
+        ("adl", "adlRankIndicator", int, 0),  # 0~5
+        ("entryPrice", "avgPrice", float, 0),  # 平均入场价
+        ("liquidationPrice", "liqPrice", float, 0),  # 强平价格
+        ("markPrice", "markPrice", float, 0),  # 标记价格
+        ("leverage", "leverage", float, 1),  # 杠杆倍数
+        ("pair", "symbol", _raw, None),  # "BTCUSDT"
+        ("unRealizedProfit", "unrealisedPnl", float, 0),  # 未实现盈亏
+        ("updateTime", "updatedTime", int, 0),  # 更新时间（毫秒）
+    )
 
     def __init__(self, binance_position, exchange_code=None):
         self.exchange_code = exchange_code
-        self.adl = int(binance_position.get("adlRankIndicator") or 0)  # 0~5
-        self.entryPrice = float(binance_position.get("avgPrice") or 0)  # 平均入场价
-        self.liquidationPrice = float(binance_position.get("liqPrice") or 0)  # 强平价格
+        get = binance_position.get
+        self._populate(self, get)
         self.fundingFee = 0  # Bybit在仓位信息中不直接返回funding fee
-        self.markPrice = float(binance_position.get("markPrice") or 0)  # 标记价格
-        self.leverage = float(binance_position.get("leverage") or 1)  # 杠杆倍数
 
         # 仓位数量（Bybit使用size字段）
-        size = float(binance_position.get("size") or 0)
-        side = binance_position.get("side")  # "Buy" or "Sell"
+        size = float(get("size") or 0)
+        side = get("side")  # "Buy" or "Sell"
 
         # 根据方向确定仓位正负
         self.positionAmt = size if side == "Buy" else -size
-        self.notional = float(binance_position.get("positionValue") or 0)
+        self.notional = float(get("positionValue") or 0)
         self.notional = self.notional if side == "Buy" else -self.notional
-        self.pair = binance_position.get("symbol")
-        self.symbol = self.pair.replace("USDT", "")  # "BTCUSDT"
-        self.unRealizedProfit = float(binance_position.get("unrealisedPnl") or 0)  # 未实现盈亏
-        self.updateTime = int(binance_position.get("updatedTime") or 0)  # 更新时间（毫秒）
+        self.symbol = pair_to_symbol(self.pair)  # "BTCUSDT"
 
         # 确定仓位方向
         if self.positionAmt > 0:
-            self.position_side = TradeDirection.long
+            self.position_side = _LONG
         elif self.positionAmt < 0:
-            self.position_side = TradeDirection.short
+            self.position_side = _SHORT
         else:
             self.position_side = None
 
+        self.is_long = self.position_side == _LONG
         self.funding_rate = None
+        self.profit_rate = self._calc_profit_rate()
+
+
+# 交易所代码 -> 仓位详情类, Aster 使用与 Binance 相同的仓位格式
+POSITION_DETAIL_CLASSES = {
+    sys.intern(ExchangeEnum.BINANCE): BinancePositionDetail,
+    sys.intern(ExchangeEnum.BINANCE_UNIFIED): BinanceUnifiedPositionDetail,
+    sys.intern(ExchangeEnum.ASTER): BinancePositionDetail,
+    sys.intern(ExchangeEnum.OKX): OkxPositionDetail,
+    sys.intern(ExchangeEnum.BITGET): BitgetPositionDetail,
+    sys.intern(ExchangeEnum.HYPERLIQUID): HyperliquidPositionDetail,
+    sys.intern(ExchangeEnum.LIGHTER): LighterPositionDetail,
+    sys.intern(ExchangeEnum.BYBIT): BybitPositionDetail,
+}
 
+
+def make_position(exchange_code, raw):
+    """按交易所代码构造仓位详情, 一次字典查找完成分派"""
+    return POSITION_DETAIL_CLASSES[exchange_code](raw, exchange_code)
+
+
+# np.sign(positionAmt) + 1 -> 仓位方向
+_SIDE_LUT = np.array([_SHORT, None, _LONG], dtype=object)
+
+
+class PositionsSoA:
+    """
+    仓位的列式(SoA)存储, 每个数值字段为一个 float64 数组
+    用于一次性处理大量仓位, 避免逐个构造 PositionDetail 对象
+    """
+    __slots__ = ("pairs", "symbols", "entryPrice", "markPrice", "liquidationPrice", "positionAmt", "notional",
+                 "unRealizedProfit", "position_side")
+
+    def __init__(self, pairs, symbols, entryPrice, markPrice, liquidationPrice, positionAmt, notional,
+                 unRealizedProfit):
+        self.pairs = pairs
+        self.symbols = symbols
+        self.entryPrice = entryPrice
+        self.markPrice = markPrice
+        self.liquidationPrice = liquidationPrice
+        self.positionAmt = positionAmt
+        self.notional = notional
+        self.unRealizedProfit = unRealizedProfit
+        self.position_side = _SIDE_LUT[np.sign(positionAmt).astype(np.int8) + 1]
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def profit_rate(self):
+        """收益率向量: unRealizedProfit / |notional|, notional 为 0 时为 0"""
+        notional = np.abs(self.notional)
+        return np.divide(self.unRealizedProfit, notional, out=np.zeros_like(notional), where=notional != 0)
+
+
+class PositionBook(PositionsSoA):
+    """
+    跨交易所的仓位簿, 由任意 PositionDetail 对象列表构建
+    汇总指标(收益率/总名义价值/总未实现盈亏)通过一次 numpy 运算完成
+    缺失的价格字段(如 HyperLiquid 的 markPrice)记为 nan
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_positions(cls, positions):
+        positions = list(positions)
+
+        def column(attr):
+            return np.array([getattr(p, attr) for p in positions], dtype=np.float64)
+
+        return cls(np.array([p.pair for p in positions], dtype=object),
+                   np.array([p.symbol for p in positions], dtype=object),
+                   column("entryPrice"), column("markPrice"), column("liquidationPrice"),
+                   column("positionAmt"), column("notional"), column("unRealizedProfit"))
+
+    def profit_rate_vector(self) -> np.ndarray:
+        """各仓位收益率, float64 向量"""
+        return self.profit_rate()
+
+    def total_notional(self) -> float:
+        """总仓位价值(名义价值绝对值之和)"""
+        return float(np.abs(self.notional).sum())
+
+    def total_unrealized_pnl(self) -> float:
+        """总未实现盈亏"""
+        return float(self.unRealizedProfit.sum())
+
+
+_binance_position_columns = itemgetter("entryPrice", "markPrice", "liquidationPrice", "positionAmt", "notional",
+                                       "unRealizedProfit")
+
+
+def parse_binance_positions(raw_list):
+    """
+    将 Binance positionRisk 返回的仓位列表批量解析为 PositionsSoA
+    数值字段在一次 np.array 调用中完成 str -> float 转换
+    """
+    columns = np.array([_binance_position_columns(p) for p in raw_list], dtype=np.float64).reshape(-1, 6)
+    pairs = np.array([p["symbol"] for p in raw_list], dtype=object)
+    symbols = np.array([pair_to_symbol(pair) for pair in pairs], dtype=object)
+    return PositionsSoA(pairs, symbols, *columns.T)
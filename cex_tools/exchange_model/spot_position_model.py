@@ -9,9 +9,74 @@
 from cex_tools.exchange_model.base_model import BaseModel, TradeDirection
 
 
+def _float_or_zero(value):
+    return float(value) if value else 0.0
+
+
+class _LazyFloatField:
+    """首次访问时从原始数据解析 float, 结果缓存到对应的 "_字段名" 槽位"""
+    __slots__ = ("name", "cache")
+
+    def __init__(self, name):
+        self.name = name
+        self.cache = "_" + name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self.cache)
+        except AttributeError:
+            value = _float_or_zero(obj._raw.get(self.name))
+            setattr(obj, self.cache, value)
+            return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.cache, value)
+
+
 class OkxSpotDetail(BaseModel):
+    # 数值字段, 缺省或空串记为 0
+    _FLOAT_FIELDS = (
+        "accAvgPx",  # '0.1318860746331176'
+        "availBal",  # '757.159125'
+        "availEq",  # '757.159125'
+        "borrowFroz",  # '0'
+        "cashBal",  # '757.159125'
+        "crossLiab",  # '0'
+        "disEq",  # '83.3941117548'
+        "eq",  # '757.159125'
+        "eqUsd",  # '104.2426396935'
+        "fixedBal",  # '0'
+        "frozenBal",  # '0'
+        "interest",  # '0'
+        "isoEq",  # '0'
+        "isoLiab",  # '0'
+        "isoUpl",  # '0'
+        "liab",  # '0'
+        "maxLoan",  # '2671.6171377454893'
+        "openAvgPx",  # '0.1318267258995327'
+        "ordFrozen",  # '0'
+        "smtSyncEq",  # '0'
+        "spotBal",  # '757.159125'
+        "spotCopyTradingEq",  # '0'
+        "spotIsoBal",  # '0'
+        "spotUpl",  # '4.428831259794996'
+        "spotUplRatio",  # '0.0443709275228844'
+        "stgyEq",  # '0'
+        "totalPnl",  # '4.383894824603985'
+        "totalPnlRatio",  # '0.0439009606054991'
+        "twap",  # '0'
+        "upl",  # '0'
+        "uplLiab",  # '0'
+    )
+    __slots__ = ("_raw", "ccy", "pair", "symbol", "position_side", "is_long",
+                 "clSpotInUseAmt", "imr", "maxSpotInUse", "mgnRatio", "mmr", "notionalLever", "rewardBal",
+                 "spotInUseAmt", "uTime", "adl", "entryPrice", "fundingFee", "funding_rate", "positionAmt",
+                 "notional", "unRealizedProfit", "updateTime") + tuple("_" + name for name in _FLOAT_FIELDS)
 
     def __init__(self, spot_info):
+        self._raw = spot_info
         self.ccy = spot_info["ccy"]  # 'OL'
         if self.ccy == "USDT":
             self.pair = self.ccy
@@ -19,46 +84,16 @@ class OkxSpotDetail(BaseModel):
             self.pair = self.ccy + "USDT"  # 'OLUSDT'
         self.symbol = self.ccy  # 'OL'
         self.position_side = TradeDirection.long
-        self.accAvgPx = float(spot_info.get("accAvgPx") or 0)  # '0.1318860746331176'
-        self.availBal = float(spot_info.get("availBal") or 0)  # '757.159125'
-        self.availEq = float(spot_info.get("availEq") or 0)  # '757.159125'
-        self.borrowFroz = float(spot_info.get("borrowFroz") or 0)  # '0'
-        self.cashBal = float(spot_info.get("cashBal") or 0)  # '757.159125'
+        self.is_long = True
         self.clSpotInUseAmt = spot_info["clSpotInUseAmt"]  # ''
-        self.crossLiab = float(spot_info.get("crossLiab") or 0)  # '0'
-        self.disEq = float(spot_info.get("disEq") or 0)  # '83.3941117548'
-        self.eq = float(spot_info.get("eq") or 0)  # '757.159125'
-        self.eqUsd = float(spot_info.get("eqUsd") or 0)  # '104.2426396935'
-        self.fixedBal = float(spot_info.get("fixedBal") or 0)  # '0'
-        self.frozenBal = float(spot_info.get("frozenBal") or 0)  # '0'
         self.imr = spot_info["imr"]  # ''
-        self.interest = float(spot_info.get("interest") or 0)  # '0'
-        self.isoEq = float(spot_info.get("isoEq") or 0)  # '0'
-        self.isoLiab = float(spot_info.get("isoLiab") or 0)  # '0'
-        self.isoUpl = float(spot_info.get("isoUpl") or 0)  # '0'
-        self.liab = float(spot_info.get("liab") or 0)  # '0'
-        self.maxLoan = float(spot_info.get("maxLoan") or 0)  # '2671.6171377454893'
         self.maxSpotInUse = spot_info["maxSpotInUse"]  # ''
         self.mgnRatio = spot_info["mgnRatio"]  # ''
         self.mmr = spot_info["mmr"]  # ''
         self.notionalLever = spot_info["notionalLever"]  # ''
-        self.openAvgPx = float(spot_info.get("openAvgPx") or 0)  # '0.1318267258995327'
-        self.ordFrozen = float(spot_info.get("ordFrozen") or 0)  # '0'
         self.rewardBal = spot_info["rewardBal"]  # ''
-        self.smtSyncEq = float(spot_info.get("smtSyncEq") or 0)  # '0'
-        self.spotBal = float(spot_info.get("spotBal") or 0)  # '757.159125'
-        self.spotCopyTradingEq = float(spot_info.get("spotCopyTradingEq") or 0)  # '0'
         self.spotInUseAmt = spot_info["spotInUseAmt"]  # ''
-        self.spotIsoBal = float(spot_info.get("spotIsoBal") or 0)  # '0'
-        self.spotUpl = float(spot_info.get("spotUpl") or 0)  # '4.428831259794996'
-        self.spotUplRatio = float(spot_info.get("spotUplRatio") or 0)  # '0.0443709275228844'
-        self.stgyEq = float(spot_info.get("stgyEq") or 0)  # '0'
-        self.totalPnl = float(spot_info.get("totalPnl") or 0)  # '4.383894824603985'
-        self.totalPnlRatio = float(spot_info.get("totalPnlRatio") or 0)  # '0.0439009606054991'
-        self.twap = float(spot_info.get("twap") or 0)  # '0'
         self.uTime = int(spot_info["uTime"])  # '1732594096563'
-        self.upl = float(spot_info.get("upl") or 0)  # '0'
-        self.uplLiab = float(spot_info.get("uplLiab") or 0)  # '0'
 
         self.adl = 0
         self.entryPrice = self.openAvgPx
@@ -68,3 +103,13 @@ class OkxSpotDetail(BaseModel):
         self.notional = self.eqUsd
         self.unRealizedProfit = self.spotUpl
         self.updateTime = self.uTime
+
+    def _field_items(self):
+        fields = {k: v for k, v in super()._field_items() if not k.startswith("_")}
+        fields.update((name, getattr(self, name)) for name in self._FLOAT_FIELDS)
+        return fields.items()
+
+
+for _name in OkxSpotDetail._FLOAT_FIELDS:
+    setattr(OkxSpotDetail, _name, _LazyFloatField(_name))
+del _name
@@ -8,18 +8,27 @@
 """
 import time
 
+import numpy as np
+
 from cex_tools.exchange_model.base_model import OkxBaseModel, TradeDirection, BaseModel
 
+# 表中没有的 side 按卖方向处理 (OKX 为 short, HyperLiquid 符号为 -1)
+_OKX_SIDE = {"buy": TradeDirection.long, "sell": TradeDirection.short}
+# HyperLiquid: B 为主动买, A 为主动卖
+_HL_SIDE_SIGN = {"B": 1.0, "A": -1.0}
+
 
 class OkxTradeModel(OkxBaseModel):
-    def __init__(self, trade):
+    __slots__ = ("tradeId", "price", "size", "volume", "side", "ts", "count", "time")
+
+    def __init__(self, trade, _side_map=_OKX_SIDE):
         self._pair = trade["instId"]
         super().__init__(self._pair)
         self.tradeId = trade["tradeId"]
         self.price = float(trade["px"])
         self.size = float(trade["sz"])
         self.volume = self.price * self.size
-        self.side = TradeDirection.long if trade["side"] == "buy" else TradeDirection.short
+        self.side = _side_map.get(trade["side"], TradeDirection.short)
         self.ts = int(trade["ts"])
         self.count = int(trade["count"])
         self.time = self.ts
@@ -29,21 +38,20 @@ class HyperLiquidTradeModel(BaseModel):
     """
         聚合Trade数据(一段列表)
     """
+    __slots__ = ("pair", "tradeId", "size", "volume", "total_volume", "side", "price", "ts", "count", "time")
 
-    def __init__(self, trades):
+    def __init__(self, trades, _side_sign=_HL_SIDE_SIGN):
         self.pair = trades[0]["coin"] + "USDT"
         self.tradeId = trades[0]["tid"]
-        self.size = 0
-        self.volume = 0
-        self.side = 0
-        self.total_volume = 0
-        for trade in trades:
-            size = float(trade["sz"])
-            price = float(trade["px"])
-            self.size += size
-            self.volume += price * size
-            side_sign = 1 if trade["side"] == "B" else -1
-            self.total_volume += side_sign * self.volume
+        n = len(trades)
+        sizes = np.fromiter((trade["sz"] for trade in trades), dtype=np.float64, count=n)
+        prices = np.fromiter((trade["px"] for trade in trades), dtype=np.float64, count=n)
+        signs = np.fromiter((_side_sign.get(trade["side"], -1.0) for trade in trades), dtype=np.float64, count=n)
+        volumes = prices * sizes
+        self.size = float(sizes.sum())
+        self.volume = float(volumes.sum())
+        # 主动买卖净成交额(买为正, 卖为负)
+        self.total_volume = float(np.dot(signs, volumes))
         self.side = TradeDirection.long if self.total_volume > 0 else TradeDirection.short
         self.price = self.volume / self.size
         self.ts = trades[0]["time"]
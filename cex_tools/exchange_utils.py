@@ -8,11 +8,65 @@
 """
 import time
 import asyncio
+import bisect
+import weakref
+from operator import attrgetter
+import numpy as np
 from typing import List, Dict, Tuple, Optional, Union
 from loguru import logger
 from cex_tools.base_exchange import BaseExchange
 from cex_tools.cex_enum import ExchangeEnum
 
+# 旧式订单簿档位对象的 (数量, 价格) 提取器
+_quantity_price = attrgetter('quantity', 'price')
+
+# 清算风险分档: 价格距离落在 (-inf, 0.05], (0.05, 0.1], (0.1, 0.2], (0.2, inf) 依次对应
+_RISK_THRESH = (0.05, 0.10, 0.20)
+_RISK_THRESH_ARRAY = np.array(_RISK_THRESH)
+_RISK_LABELS = ('critical', 'high', 'medium', 'low')
+_RISK_LABELS_ARRAY = np.array(_RISK_LABELS, dtype=object)
+
+# 订单簿深度缓存: 订单簿对象(弱引用) -> {(time, depth_levels): 深度信息}, 订单簿释放后自动清除
+_depth_cache = weakref.WeakKeyDictionary()
+
+# 价格短时缓存: (交易对, 交易所代码元组) -> (获取时间, 价格字典)
+_price_cache: Dict[tuple, Tuple[float, Dict]] = {}
+# 事件循环(弱引用) -> {key: 进行中的查询任务}, 同一 key 的并发请求合并为一次查询
+# 任务只能在所属循环中等待, 查询完成即移除, 不会随 key 增多而常驻
+_price_inflight = weakref.WeakKeyDictionary()
+# 缓存条目超过上限时, 清理超过 _PRICE_CACHE_STALE 秒未刷新的条目
+_PRICE_CACHE_MAX = 1024
+_PRICE_CACHE_STALE = 60.0
+
+
+def _cached_order_book_depth(orderbook, depth_levels: int = 5) -> Dict[str, float]:
+    """同一订单簿快照在多次信号计算间复用深度结果, 返回值只读"""
+    try:
+        cached = _depth_cache.setdefault(orderbook, {})
+    except TypeError:
+        return ExchangeUtils.calculate_order_book_depth(orderbook, depth_levels)
+    key = (getattr(orderbook, 'time', None), depth_levels)
+    if (depth := cached.get(key)) is None:
+        depth = cached[key] = ExchangeUtils.calculate_order_book_depth(orderbook, depth_levels)
+    return depth
+
+
+def _min_max_items(values: Dict) -> Tuple:
+    """
+    单次遍历求最小/最大值及其键
+
+    Returns:
+        (最小键, 最小值, 最大键, 最大值)
+    """
+    it = iter(values.items())
+    min_key, min_value = max_key, max_value = next(it)
+    for key, value in it:
+        if value < min_value:
+            min_key, min_value = key, value
+        elif value > max_value:
+            max_key, max_value = key, value
+    return min_key, min_value, max_key, max_value
+
 
 class ExchangeUtils:
     """
@@ -26,36 +80,65 @@ class ExchangeUtils:
     """
 
     @staticmethod
-    async def compare_prices(exchanges: List[BaseExchange], symbol: str) -> Dict[ExchangeEnum, float]:
+    async def compare_prices(exchanges: List[BaseExchange], symbol: str,
+                             ttl: float = 0.1) -> Dict[ExchangeEnum, float]:
         """
         比较多个交易所的价格
 
         Args:
             exchanges: 交易所列表
             symbol: 交易对符号
+            ttl: 价格缓存有效期（秒），ttl 内的重复调用直接复用上次结果，<=0 不使用缓存
 
         Returns:
             价格字典 {交易所: 价格}
         """
-        prices = {}
+        codes = [exchange.exchange_code for exchange in exchanges]
+        if ttl <= 0:
+            return await ExchangeUtils._fetch_prices(exchanges, codes, symbol)
+
+        key = (symbol, tuple(codes))
+        if (entry := _price_cache.get(key)) is not None and time.monotonic() - entry[0] < ttl:
+            return dict(entry[1])
+
+        inflight = _price_inflight.get(loop := asyncio.get_running_loop())
+        if inflight is None:
+            inflight = _price_inflight[loop] = {}
+        task = inflight.get(key)
+        if task is None:
+            task = inflight[key] = loop.create_task(
+                ExchangeUtils._fetch_and_cache_prices(exchanges, codes, symbol, key))
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        # shield: 某个调用方被取消时不影响其他等待同一查询的调用方
+        prices = await asyncio.shield(task)
+        return dict(prices)
 
-        # 并发获取价格
-        async def get_all_prices():
-            tasks = []
-            for exchange in exchanges:
-                tasks.append(exchange.get_tick_price(symbol))
+    @staticmethod
+    async def _fetch_and_cache_prices(exchanges: List[BaseExchange], codes: List, symbol: str,
+                                      key: tuple) -> Dict[ExchangeEnum, float]:
+        """查询价格并写入缓存, 缓存条目过多时清理长时间未刷新的条目"""
+        prices = await ExchangeUtils._fetch_prices(exchanges, codes, symbol)
+        now = time.monotonic()
+        _price_cache[key] = (now, prices)
+        if len(_price_cache) > _PRICE_CACHE_MAX:
+            for stale_key in [k for k, (t, _) in _price_cache.items() if now - t > _PRICE_CACHE_STALE]:
+                del _price_cache[stale_key]
+        return prices
 
-            results = await asyncio.gather(*tasks)
+    @staticmethod
+    async def _fetch_prices(exchanges: List[BaseExchange], codes: List, symbol: str) -> Dict[ExchangeEnum, float]:
+        """并发获取各交易所价格, 失败的交易所记为 0"""
+        prices = {}
 
-            for i, result in enumerate(results):
-                exchange_code = exchanges[i].exchange_code
-                if isinstance(result, Exception):
-                    logger.error(f"{exchange_code} 价格查询异常: {result}")
-                    prices[exchange_code] = 0
-                else:
-                    prices[exchange_code] = result
+        # 并发获取价格
+        tasks = [exchange.get_tick_price(symbol) for exchange in exchanges]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        await get_all_prices()
+        prices.update(zip(codes, results))
+        # 只对失败项回填 0 并记录日志, 成功项不再逐个分支判断
+        for exchange_code in [c for c, r in prices.items() if isinstance(r, Exception)]:
+            logger.error("{} 价格查询异常: {}", exchange_code, prices[exchange_code])
+            prices[exchange_code] = 0
 
         return prices
 
@@ -74,17 +157,139 @@ class ExchangeUtils:
             套利机会字典，无机会返回None
         """
         prices = await ExchangeUtils.compare_prices(exchanges, symbol)
+        return ExchangeUtils._arbitrage_from_prices(symbol, prices, min_profit_rate)
+
+    @staticmethod
+    async def compare_prices_batch(exchanges: List[BaseExchange],
+                                   symbols: List[str]) -> Tuple[List[ExchangeEnum], np.ndarray]:
+        """
+        批量比较多个交易对在多个交易所的价格, 所有查询在同一次 gather 中并发完成
+
+        Args:
+            exchanges: 交易所列表
+            symbols: 交易对列表
+
+        Returns:
+            (交易所代码列表, 价格矩阵), 价格矩阵形状为 (交易对数, 交易所数), 查询失败记为 0
+        """
+        codes = [exchange.exchange_code for exchange in exchanges]
+        tasks = [exchange.get_tick_price(symbol) for symbol in symbols for exchange in exchanges]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for i in [i for i, r in enumerate(results) if isinstance(r, Exception)]:
+            symbol, exchange_code = symbols[i // len(codes)], codes[i % len(codes)]
+            logger.error("{} {} 价格查询异常: {}", exchange_code, symbol, results[i])
+            results[i] = 0
+
+        prices = np.array(results, dtype=np.float64).reshape(len(symbols), len(codes))
+        return codes, prices
+
+    @staticmethod
+    async def find_arbitrage_opportunities_batch(exchanges: List[BaseExchange], symbols: List[str],
+                                                 min_profit_rate: float = 0.001) -> List[Dict]:
+        """
+        批量寻找套利机会, 在价格矩阵上按行向量化计算最高/最低价与利润率
 
+        Args:
+            exchanges: 交易所列表
+            symbols: 交易对列表
+            min_profit_rate: 最小利润率
+
+        Returns:
+            套利机会列表, 每项格式与 find_arbitrage_opportunity 返回值一致
+        """
+        if not symbols or not exchanges:
+            return []
+        codes, prices = await ExchangeUtils.compare_prices_batch(exchanges, symbols)
+
+        # 无效价格置为 nan, 不参与最高/最低价比较
+        valid = prices > 0
+        masked = np.where(valid, prices, np.nan)
+        candidates = valid.sum(axis=1) >= 2
+        if not candidates.any():
+            return []
+
+        rows = np.flatnonzero(candidates)
+        masked = masked[rows]
+        min_idx = np.nanargmin(masked, axis=1)
+        max_idx = np.nanargmax(masked, axis=1)
+        arange = np.arange(len(rows))
+        min_price = masked[arange, min_idx]
+        max_price = masked[arange, max_idx]
+        profit_rate = (max_price - min_price) / min_price
+
+        opportunities = []
+        for k in np.flatnonzero(profit_rate >= min_profit_rate):
+            row = rows[k]
+            opportunities.append({
+                'symbol': symbols[row],
+                'buy_exchange': codes[min_idx[k]],
+                'sell_exchange': codes[max_idx[k]],
+                'buy_price': float(min_price[k]),
+                'sell_price': float(max_price[k]),
+                'profit_rate': float(profit_rate[k]),
+                'profit_amount': float(max_price[k] - min_price[k]),
+                'all_prices': {code: float(p) for code, p, ok in zip(codes, prices[row], valid[row]) if ok}
+            })
+        return opportunities
+
+    @staticmethod
+    async def find_arbitrage_opportunity_with_depth(exchanges: List[BaseExchange], symbol: str,
+                                                    min_profit_rate: float = 0.001,
+                                                    depth_levels: int = 5) -> Optional[Dict]:
+        """
+        寻找套利机会并附带买卖两侧订单簿深度, 价格与订单簿在同一次 gather 中并发获取
+
+        Args:
+            exchanges: 交易所列表
+            symbol: 交易对符号
+            min_profit_rate: 最小利润率
+            depth_levels: 深度档位
+
+        Returns:
+            套利机会字典，无机会返回None
+        """
+        n = len(exchanges)
+        codes = [exchange.exchange_code for exchange in exchanges]
+        tasks = [*(exchange.get_tick_price(symbol) for exchange in exchanges),
+                 *(exchange.get_order_books(symbol) for exchange in exchanges)]
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        prices = {}
+        orderbooks = {}
+        for exchange_code, price, orderbook in zip(codes, results[:n], results[n:]):
+            if isinstance(price, Exception):
+                logger.error("{} 价格查询异常: {}", exchange_code, price)
+                prices[exchange_code] = 0
+            else:
+                prices[exchange_code] = price
+            if isinstance(orderbook, Exception):
+                logger.error("{} 订单簿查询异常: {}", exchange_code, orderbook)
+            else:
+                orderbooks[exchange_code] = orderbook
+
+        opportunity = ExchangeUtils._arbitrage_from_prices(symbol, prices, min_profit_rate)
+        if opportunity is None:
+            return None
+
+        buy_depth = ExchangeUtils.calculate_order_book_depth(orderbooks.get(opportunity['buy_exchange']), depth_levels)
+        sell_depth = ExchangeUtils.calculate_order_book_depth(orderbooks.get(opportunity['sell_exchange']), depth_levels)
+        opportunity['buy_depth'] = buy_depth.get('total_depth', 0)
+        opportunity['sell_depth'] = sell_depth.get('total_depth', 0)
+        return opportunity
+
+    @staticmethod
+    def _arbitrage_from_prices(symbol: str, prices: Dict[ExchangeEnum, float],
+                               min_profit_rate: float) -> Optional[Dict]:
+        """根据各交易所价格计算套利机会"""
         # 过滤有效价格
         valid_prices = {ex: price for ex, price in prices.items() if price > 0}
         if len(valid_prices) < 2:
             return None
 
         # 找出最高价和最低价
-        max_exchange = max(valid_prices, key=valid_prices.get)
-        min_exchange = min(valid_prices, key=valid_prices.get)
-        max_price = valid_prices[max_exchange]
-        min_price = valid_prices[min_exchange]
+        min_exchange, min_price, max_exchange, max_price = _min_max_items(valid_prices)
 
         # 计算利润率
         profit_rate = (max_price - min_price) / min_price
@@ -117,26 +322,21 @@ class ExchangeUtils:
         Returns:
             资金费率字典 {交易对: {交易所: 费率}}
         """
-        funding_rates = {}
+        funding_rates = {symbol: {} for symbol in symbols}
+        codes = [exchange.exchange_code for exchange in exchanges]
 
-        for symbol in symbols:
-            rates = {}
-            # 并发获取所有交易所的费率
-            tasks = []
-            for exchange in exchanges:
-                tasks.append(exchange.get_funding_rate(symbol, apy=apy))
+        # 所有交易对 × 交易所一次性并发获取, 索引与任务一一对应
+        index = [(symbol, exchange_code) for symbol in symbols for exchange_code in codes]
+        tasks = [exchange.get_funding_rate(symbol, apy=apy) for symbol in symbols for exchange in exchanges]
 
-            results = await asyncio.gather(*tasks)
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
-            for i, result in enumerate(results):
-                exchange_code = exchanges[i].exchange_code
-                if isinstance(result, Exception):
-                    logger.error(f"获取 {exchange_code} {symbol} 资金费率失败: {result}")
-                    rates[exchange_code] = 0
-                else:
-                    rates[exchange_code] = result
+        for (symbol, exchange_code), result in zip(index, results):
+            funding_rates[symbol][exchange_code] = result
 
-            funding_rates[symbol] = rates
+        for symbol, exchange_code in [key for key, r in zip(index, results) if isinstance(r, Exception)]:
+            logger.error("获取 {} {} 资金费率失败: {}", exchange_code, symbol, funding_rates[symbol][exchange_code])
+            funding_rates[symbol][exchange_code] = 0
 
         return funding_rates
 
@@ -163,10 +363,7 @@ class ExchangeUtils:
             return None
 
         # 找出最高费率和最低费率
-        max_exchange = max(valid_rates, key=valid_rates.get)
-        min_exchange = min(valid_rates, key=valid_rates.get)
-        max_rate = valid_rates[max_exchange]
-        min_rate = valid_rates[min_exchange]
+        min_exchange, min_rate, max_exchange, max_rate = _min_max_items(valid_rates)
 
         # 计算费率差
         rate_diff = abs(max_rate - min_rate)
@@ -198,14 +395,29 @@ class ExchangeUtils:
         Returns:
             深度信息
         """
-        if not orderbook or not hasattr(orderbook, 'bids') or not hasattr(orderbook, 'asks'):
+        if not orderbook:
             return {}
 
-        bids_depth = sum(bid.quantity * bid.price for bid in orderbook.bids[:depth_levels])
-        asks_depth = sum(ask.quantity * ask.price for ask in orderbook.asks[:depth_levels])
+        # 先判断数组列: bids/asks 是惰性属性, hasattr 会触发构造完整的档位对象列表
+        if getattr(orderbook, 'bid_px', None) is not None:
+            # 数组化订单簿: 直接对价格/数量数组做点积
+            bid_px, bid_qty = orderbook.bid_px[:depth_levels], orderbook.bid_qty[:depth_levels]
+            ask_px, ask_qty = orderbook.ask_px[:depth_levels], orderbook.ask_qty[:depth_levels]
+            bids_depth = float(np.dot(bid_px, bid_qty))
+            asks_depth = float(np.dot(ask_px, ask_qty))
+            n_bids, n_asks = len(bid_px), len(ask_px)
+            spread = float(ask_px[0] - bid_px[0]) if n_bids and n_asks else 0
+        elif hasattr(orderbook, 'bids') and hasattr(orderbook, 'asks'):
+            bids = orderbook.bids[:depth_levels]
+            asks = orderbook.asks[:depth_levels]
+            bids_depth = sum(q * p for q, p in map(_quantity_price, bids))
+            asks_depth = sum(q * p for q, p in map(_quantity_price, asks))
+            n_bids, n_asks = len(bids), len(asks)
+            spread = asks[0].price - bids[0].price if bids and asks else 0
+        else:
+            return {}
         total_depth = bids_depth + asks_depth
 
-        spread = orderbook.asks[0].price - orderbook.bids[0].price if orderbook.bids and orderbook.asks else 0
         spread_pct = spread / orderbook.mid_price if orderbook.mid_price > 0 else 0
 
         return {
@@ -214,7 +426,7 @@ class ExchangeUtils:
             'total_depth': total_depth,
             'spread': spread,
             'spread_pct': spread_pct,
-            'levels_analyzed': min(depth_levels, len(orderbook.bids), len(orderbook.asks))
+            'levels_analyzed': min(n_bids, n_asks)
         }
 
     @staticmethod
@@ -229,46 +441,94 @@ class ExchangeUtils:
         Returns:
             健康状态字典
         """
-        health_status = {}
-
-        async def check_exchange_health(exchange):
-            start_time = time.time()
-            try:
-                # 测试价格查询（异步调用）
-                price = await exchange.get_tick_price("BTCUSDT")
-                response_time = time.time() - start_time
-
-                status = {
-                    'healthy': price > 0,
-                    'response_time': response_time,
-                    'last_check': time.time(),
-                    'error': None,
-                    'price': price
-                }
-            except Exception as e:
-                status = {
-                    'healthy': False,
-                    'response_time': timeout,
-                    'last_check': time.time(),
-                    'error': str(e),
-                    'price': 0
-                }
-
-            return exchange.exchange_code, status
-
-        async def check_all_exchanges():
-            tasks = []
-            for exchange in exchanges:
-                tasks.append(check_exchange_health(exchange))
-
-            results = await asyncio.gather(*tasks)
-
-            for exchange_code, status in results:
-                health_status[exchange_code] = status
-
-        await check_all_exchanges()
-
-        return health_status
+        codes = [exchange.exchange_code for exchange in exchanges]
+
+        tasks = [ExchangeUtils._check_exchange_health(exchange, timeout) for exchange in exchanges]
+        results = await asyncio.gather(*tasks)
+
+        return dict(zip(codes, results))
+
+    @staticmethod
+    async def _check_exchange_health(exchange: BaseExchange, timeout: float) -> Dict:
+        """以 BTCUSDT 价格查询探测单个交易所的健康状态"""
+        start_time = time.time()
+        try:
+            # 测试价格查询（异步调用）
+            price = await asyncio.wait_for(exchange.get_tick_price("BTCUSDT"), timeout=timeout)
+            response_time = time.time() - start_time
+
+            status = {
+                'healthy': price > 0,
+                'response_time': response_time,
+                'last_check': time.time(),
+                'error': None,
+                'price': price
+            }
+        except asyncio.TimeoutError:
+            status = {
+                'healthy': False,
+                'response_time': timeout,
+                'last_check': time.time(),
+                'error': 'timeout',
+                'price': 0
+            }
+        except Exception as e:
+            status = {
+                'healthy': False,
+                'response_time': timeout,
+                'last_check': time.time(),
+                'error': str(e),
+                'price': 0
+            }
+
+        return status
+
+    @staticmethod
+    async def snapshot(exchanges: List[BaseExchange], symbols: List[str], apy: bool = True,
+                       timeout: float = 5.0) -> Dict[str, Dict]:
+        """
+        一次 gather 同时完成健康检查、价格查询与资金费率查询
+
+        Args:
+            exchanges: 交易所列表
+            symbols: 交易对列表
+            apy: 资金费率是否转换为年化
+            timeout: 健康检查超时时间（秒）
+
+        Returns:
+            {'health': monitor_exchange_health 格式,
+             'prices': {交易对: {交易所: 价格}},
+             'funding_rates': compare_funding_rates 格式}
+        """
+        n = len(exchanges)
+        codes = [exchange.exchange_code for exchange in exchanges]
+        index = [(symbol, exchange_code) for symbol in symbols for exchange_code in codes]
+
+        tasks = [ExchangeUtils._check_exchange_health(exchange, timeout) for exchange in exchanges]
+        tasks += [exchange.get_tick_price(symbol) for symbol in symbols for exchange in exchanges]
+        tasks += [exchange.get_funding_rate(symbol, apy=apy) for symbol in symbols for exchange in exchanges]
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        m = len(index)
+        health_results, price_results, rate_results = results[:n], results[n:n + m], results[n + m:]
+
+        prices = {symbol: {} for symbol in symbols}
+        funding_rates = {symbol: {} for symbol in symbols}
+        for (symbol, exchange_code), price, rate in zip(index, price_results, rate_results):
+            if isinstance(price, Exception):
+                logger.error("{} {} 价格查询异常: {}", exchange_code, symbol, price)
+                price = 0
+            if isinstance(rate, Exception):
+                logger.error("获取 {} {} 资金费率失败: {}", exchange_code, symbol, rate)
+                rate = 0
+            prices[symbol][exchange_code] = price
+            funding_rates[symbol][exchange_code] = rate
+
+        return {
+            'health': dict(zip(codes, health_results)),
+            'prices': prices,
+            'funding_rates': funding_rates,
+        }
 
     @staticmethod
     def get_liquidation_risk(position, current_price: float, liquidation_price: float) -> Dict[str, float]:
@@ -287,13 +547,7 @@ class ExchangeUtils:
             return {}
 
         # 计算价格距离
-        if hasattr(position, 'position_side'):
-            is_long = position.position_side.value if hasattr(position.position_side, 'value') else position.position_side == 'long'
-        else:
-            # 根据仓位数量判断方向
-            is_long = position.positionAmt > 0 if hasattr(position, 'positionAmt') else True
-
-        if is_long:
+        if ExchangeUtils._is_long_position(position):
             # 多头：清算价格 < 当前价格
             price_distance = (current_price - liquidation_price) / current_price
         else:
@@ -301,14 +555,7 @@ class ExchangeUtils:
             price_distance = (liquidation_price - current_price) / current_price
 
         # 风险等级
-        if price_distance > 0.2:
-            risk_level = 'low'
-        elif price_distance > 0.1:
-            risk_level = 'medium'
-        elif price_distance > 0.05:
-            risk_level = 'high'
-        else:
-            risk_level = 'critical'
+        risk_level = _RISK_LABELS[bisect.bisect_left(_RISK_THRESH, price_distance)]
 
         return {
             'price_distance_pct': price_distance,
@@ -318,6 +565,51 @@ class ExchangeUtils:
             'liquidation_price': liquidation_price
         }
 
+    @staticmethod
+    def get_liquidation_risks_vectorized(positions, current_prices, liquidation_prices) -> Dict[str, np.ndarray]:
+        """
+        批量计算清算风险, 与 get_liquidation_risk 逐个计算结果一致
+
+        Args:
+            positions: 仓位对象列表
+            current_prices: 当前价格数组
+            liquidation_prices: 清算价格数组
+
+        Returns:
+            风险指标数组字典, 无效仓位(价格<=0或仓位为空)的距离为 nan, 风险等级为 None
+        """
+        current_prices = np.asarray(current_prices, dtype=np.float64)
+        liquidation_prices = np.asarray(liquidation_prices, dtype=np.float64)
+        is_long = np.fromiter((bool(p) and ExchangeUtils._is_long_position(p) for p in positions),
+                              dtype=bool, count=len(positions))
+        valid = (np.fromiter((bool(p) for p in positions), dtype=bool, count=len(positions))
+                 & (current_prices > 0) & (liquidation_prices > 0))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_distance = (current_prices - liquidation_prices) / current_prices
+        price_distance = np.where(is_long, price_distance, -price_distance)
+        price_distance[~valid] = np.nan
+
+        risk_level = _RISK_LABELS_ARRAY[np.searchsorted(_RISK_THRESH_ARRAY, price_distance)]
+        risk_level[~valid] = None
+
+        return {
+            'price_distance_pct': price_distance,
+            'risk_level': risk_level,
+            'is_liquidating_soon': valid & (price_distance < 0.02),
+            'current_price': current_prices,
+            'liquidation_price': liquidation_prices
+        }
+
+    @staticmethod
+    def _is_long_position(position) -> bool:
+        """判断仓位方向, 仓位模型在构造时已给出 is_long"""
+        is_long = getattr(position, 'is_long', None)
+        if is_long is None:
+            # 根据仓位数量判断方向
+            return getattr(position, 'positionAmt', 1) > 0
+        return is_long
+
     @staticmethod
     def format_currency(amount: float, currency: str = "USDT", decimal_places: int = 2) -> str:
         """
@@ -331,6 +623,13 @@ class ExchangeUtils:
         Returns:
             格式化字符串
         """
+        if decimal_places == 2:
+            # 常用精度走字面量格式, 避免运行时解析嵌套格式说明
+            if amount >= 1000000:
+                return f"${amount/1000000:.2f}M {currency}"
+            elif amount >= 1000:
+                return f"${amount/1000:.2f}K {currency}"
+            return f"${amount:.2f} {currency}"
         if amount >= 1000000:
             return f"${amount/1000000:.{decimal_places}f}M {currency}"
         elif amount >= 1000:
@@ -355,7 +654,8 @@ class ExchangeUtils:
 
     @staticmethod
     def get_trading_signal(prices: Dict[ExchangeEnum, float], orderbooks: Dict[ExchangeEnum, object],
-                         min_spread: float = 0.002) -> Optional[Dict]:
+                         min_spread: float = 0.002,
+                         depths: Optional[Dict[ExchangeEnum, Dict]] = None) -> Optional[Dict]:
         """
         生成交易信号
 
@@ -363,6 +663,7 @@ class ExchangeUtils:
             prices: 价格字典
             orderbooks: 订单簿字典
             min_spread: 最小价差
+            depths: 已计算的订单簿深度 {交易所: calculate_order_book_depth 结果}, 提供时直接复用
 
         Returns:
             交易信号
@@ -371,18 +672,14 @@ class ExchangeUtils:
             return None
 
         # 找出最佳买入和卖出价格
-        exchanges = list(prices.keys())
-        best_buy_exchange = min(exchanges, key=lambda x: prices[x])
-        best_sell_exchange = max(exchanges, key=lambda x: prices[x])
-
-        buy_price = prices[best_buy_exchange]
-        sell_price = prices[best_sell_exchange]
+        best_buy_exchange, buy_price, best_sell_exchange, sell_price = _min_max_items(prices)
         spread = (sell_price - buy_price) / buy_price
 
         if spread >= min_spread:
             # 检查订单簿深度
-            buy_depth = ExchangeUtils.calculate_order_book_depth(orderbooks[best_buy_exchange])
-            sell_depth = ExchangeUtils.calculate_order_book_depth(orderbooks[best_sell_exchange])
+            depths = depths or {}
+            buy_depth = depths.get(best_buy_exchange) or _cached_order_book_depth(orderbooks[best_buy_exchange])
+            sell_depth = depths.get(best_sell_exchange) or _cached_order_book_depth(orderbooks[best_sell_exchange])
 
             return {
                 'signal': 'arbitrage',
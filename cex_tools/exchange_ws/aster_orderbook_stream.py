@@ -7,33 +7,46 @@
 @Time        : 2025/10/4
 """
 import asyncio
-import json
 import time
 import aiohttp
 import websockets
 from loguru import logger
 from typing import Optional, Dict
 
-from cex_tools.exchange_ws.orderbook_stream import OrderBookStream, OrderBookData
+from cex_tools.exchange_ws.orderbook_stream import OrderBookStream, OrderBookData, LocalOrderBookSide
+from utils.json_utils import json_loads
+from utils.ssl_utils import shared_ssl_context
+
+_DEPTH_URL = "https://fapi.asterdex.com/fapi/v1/depth"
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10)
 
 
 class AsterOrderBookStreamAsync(OrderBookStream):
     """Aster交易所订单簿流监听器（异步实现，Binance兼容协议）"""
 
-    def __init__(self):
+    def __init__(self, top_k: int = 20):
+        """
+        :param top_k: 发布订单簿时每边保留的档位数 (本地仍维护完整订单簿)
+        """
         super().__init__("Aster")
+        self.top_k = top_k
         self._ws_connection = None
         self._listen_task: Optional[asyncio.Task] = None
+        # REST 快照共用的 HTTP 会话 (懒创建, stop 时关闭)
+        self._session: Optional[aiohttp.ClientSession] = None
 
         # 本地订单簿维护
-        self._local_orderbooks: Dict[str, Dict] = {}  # pair -> {bids: {price: qty}, asks: {price: qty}}
+        self._local_orderbooks: Dict[str, Dict[str, LocalOrderBookSide]] = {}  # pair -> {bids: 买盘, asks: 卖盘}
         self._initialized: Dict[str, bool] = {}  # pair -> initialized flag
+        # 流名称 -> 交易对, 订阅时生成, 收到推送时直接查表而不必解析流名称
+        self._stream_to_pair: Dict[str, str] = {}
 
     def subscribe(self, pair: str, callback=None):
         """订阅交易对"""
         if not pair.endswith("USDT"):
             pair += "USDT"
         super().subscribe(pair, callback)
+        self._stream_to_pair[self._get_stream_name(pair)] = pair
 
     def _get_stream_name(self, pair: str) -> str:
         """
@@ -44,23 +57,30 @@ class AsterOrderBookStreamAsync(OrderBookStream):
         # Binance格式：symbol@depth@100ms (100ms更新一次，减少消息量)
         return f"{pair.lower()}@depth@100ms"
 
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """获取 HTTP 会话, 首次使用或已关闭时创建"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=shared_ssl_context()),
+                                                  timeout=_HTTP_TIMEOUT)
+        return self._session
+
     async def _fetch_orderbook_snapshot(self, pair: str) -> Optional[dict]:
         """
         从 REST API 获取订单簿快照
         :param pair: 交易对
         :return: {"lastUpdateId": int, "bids": [...], "asks": [...]}
         """
-        url = f"https://fapi.asterdex.com/fapi/v1/depth?symbol={pair.lower()}&limit=1000"
+        url = f"{_DEPTH_URL}?symbol={pair.lower()}&limit=1000"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.debug(f"[Aster] {pair} 获取快照成功，lastUpdateId={data.get('lastUpdateId')}")
-                        return data
-                    else:
-                        logger.error(f"[Aster] {pair} 获取快照失败: HTTP {response.status}")
-                        return None
+            session = self._ensure_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    logger.debug(f"[Aster] {pair} 获取快照成功，lastUpdateId={data.get('lastUpdateId')}")
+                    return data
+                else:
+                    logger.error(f"[Aster] {pair} 获取快照失败: HTTP {response.status}")
+                    return None
         except Exception as e:
             logger.error(f"[Aster] {pair} 获取快照异常: {e}")
             return None
@@ -78,21 +98,20 @@ class AsterOrderBookStreamAsync(OrderBookStream):
                 return
 
             # 初始化本地订单簿
-            self._local_orderbooks[pair] = {
-                "bids": {},
-                "asks": {}
-            }
+            bids = LocalOrderBookSide(descending=True)
+            asks = LocalOrderBookSide(descending=False)
 
             # 加载快照数据
-            for price, qty in snapshot.get("bids", []):
-                self._local_orderbooks[pair]["bids"][float(price)] = float(qty)
-
-            for price, qty in snapshot.get("asks", []):
-                self._local_orderbooks[pair]["asks"][float(price)] = float(qty)
+            bids.load(snapshot.get("bids", []))
+            asks.load(snapshot.get("asks", []))
+            self._local_orderbooks[pair] = {
+                "bids": bids,
+                "asks": asks
+            }
 
             logger.debug(f"[Aster] {pair} 本地订单簿初始化完成，"
-                       f"bids={len(self._local_orderbooks[pair]['bids'])}, "
-                       f"asks={len(self._local_orderbooks[pair]['asks'])}")
+                       f"bids={len(bids)}, "
+                       f"asks={len(asks)}")
 
             # 标记为已初始化
             self._initialized[pair] = True
@@ -111,25 +130,17 @@ class AsterOrderBookStreamAsync(OrderBookStream):
         :param event: WebSocket 事件数据
         """
         try:
-            # 更新 bids
+            orderbook_dict = self._local_orderbooks[pair]
+
+            # 更新 bids, 数量为 0 时删除该价格层级
+            update = orderbook_dict["bids"].update
             for price, qty in event.get("b", []):
-                price = float(price)
-                qty = float(qty)
-                if qty == 0:
-                    # 删除该价格层级
-                    self._local_orderbooks[pair]["bids"].pop(price, None)
-                else:
-                    # 更新/添加该价格层级
-                    self._local_orderbooks[pair]["bids"][price] = qty
+                update(float(price), float(qty))
 
             # 更新 asks
+            update = orderbook_dict["asks"].update
             for price, qty in event.get("a", []):
-                price = float(price)
-                qty = float(qty)
-                if qty == 0:
-                    self._local_orderbooks[pair]["asks"].pop(price, None)
-                else:
-                    self._local_orderbooks[pair]["asks"][price] = qty
+                update(float(price), float(qty))
 
             # 生成并推送 OrderBookData
             self._publish_orderbook(pair)
@@ -148,13 +159,9 @@ class AsterOrderBookStreamAsync(OrderBookStream):
             if not orderbook_dict:
                 return
 
-            # 排序并转换为列表格式
-            bids = sorted(orderbook_dict["bids"].items(), key=lambda x: x[0], reverse=True)
-            asks = sorted(orderbook_dict["asks"].items(), key=lambda x: x[0])
-
-            # 转换为 [[price, qty], ...] 格式
-            bids_list = [[price, qty] for price, qty in bids]
-            asks_list = [[price, qty] for price, qty in asks]
+            # 档位已按价格有序维护, 只取最优的 top_k 档转换为 [[price, qty], ...] 格式
+            bids_list = orderbook_dict["bids"].to_list(self.top_k)
+            asks_list = orderbook_dict["asks"].to_list(self.top_k)
 
             # 创建 OrderBookData
             orderbook = OrderBookData(
@@ -190,7 +197,7 @@ class AsterOrderBookStreamAsync(OrderBookStream):
                 else:
                     logger.debug(f"[Aster] 重连WebSocket (第{retry_count}次)")
 
-                async with websockets.connect(ws_url, ping_interval=20, ping_timeout=5) as websocket:
+                async with websockets.connect(ws_url, ssl=shared_ssl_context(), ping_interval=20, ping_timeout=5) as websocket:
                     self._ws_connection = websocket
                     logger.debug(f"[Aster] WebSocket 连接成功")
 
@@ -202,7 +209,7 @@ class AsterOrderBookStreamAsync(OrderBookStream):
                     while self._running:
                         try:
                             message = await asyncio.wait_for(websocket.recv(), timeout=5)
-                            data = json.loads(message)
+                            data = json_loads(message)
 
                             # Aster 返回格式: {"stream": "btcusdt@depth@100ms", "data": {...}}
                             if "data" in data and "stream" in data:
@@ -253,11 +260,9 @@ class AsterOrderBookStreamAsync(OrderBookStream):
         :param data: 订单簿增量数据
         """
         try:
-            # 从流名称提取交易对
-            pair = stream.split("@")[0].upper()
-
             # 只处理订阅的交易对
-            if pair not in self.orderbook_callbacks:
+            pair = self._stream_to_pair.get(stream)
+            if pair is None:
                 return
 
             # 如果还未初始化，先初始化
@@ -305,6 +310,11 @@ class AsterOrderBookStreamAsync(OrderBookStream):
             except asyncio.CancelledError:
                 pass
 
+        # 关闭 HTTP 会话
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
         logger.debug(f"[Aster] WebSocket 已停止")
 
 
@@ -7,16 +7,46 @@
 @Time        : 2025/10/15
 """
 import asyncio
-import json
 import time
 import websockets
 from loguru import logger
 from typing import Optional
 
+from cex_tools.exchange_model.base_model import get_float
 from cex_tools.exchange_ws.position_stream import PositionWebSocketStream
 from cex_tools.exchange_model.position_model import BinancePositionDetail  # 使用Binance模型作为基础
 from cex_tools.exchange_model.position_event_model import PositionEventType
-
+from utils.json_utils import json_loads, json_dumps
+from utils.ssl_utils import shared_ssl_context
+
+# 内容固定的消息只序列化一次
+# Aster订阅消息格式（需要根据实际API文档调整）
+_SUBSCRIBE_POSITIONS_MSG = json_dumps({
+    "method": "subscribe",
+    "params": {
+        "channel": "positions"
+    }
+})
+_PONG_MSG = json_dumps({"method": "pong"})
+
+# 接收队列结束标记: 连接断开后入队, 解析任务处理完之前的帧后退出
+_RX_QUEUE_END = object()
+
+# 空仓位 size 的常见原始取值
+_EMPTY_SIZES = frozenset((0, "0", "0.0", "", None))
+
+# Binance 字段 -> (Aster 字段, 缺省值)
+# 这里需要根据Aster的实际数据格式进行转换
+_ASTER_POSITION_FIELDS = (
+    ("symbol", "symbol", ""),
+    ("positionAmt", "size", 0),
+    ("entryPrice", "entry_price", 0),
+    ("markPrice", "mark_price", 0),
+    ("unRealizedProfit", "unrealized_pnl", 0),
+    ("notional", "notional", 0),
+    ("leverage", "leverage", 1),
+    ("liquidationPrice", "liquidation_price", 0),
+)
 
 class AsterPositionWebSocket(PositionWebSocketStream):
     """Aster仓位WebSocket流实现"""
@@ -39,7 +69,15 @@ class AsterPositionWebSocket(PositionWebSocketStream):
 
         self._ws_connection = None
         self._listen_task: Optional[asyncio.Task] = None
-        self._auth_sent = False
+        # 接收与解析分离: 接收协程只负责入队, 回调耗时不会阻塞 recv
+        self._rx_queue_size = kwargs.get('rx_queue_size', 1024)
+        self._process_task: Optional[asyncio.Task] = None
+        # method -> 处理函数, 每帧只做一次字典查找
+        self._method_handlers = {
+            "auth": self._on_auth_message,
+            "subscribe": self._on_subscribe_message,
+            "ping": self._on_ping_message,
+        }
 
     async def _send_auth_message(self):
         """
@@ -56,7 +94,7 @@ class AsterPositionWebSocket(PositionWebSocketStream):
                 }
             }
 
-            await self._ws_connection.send(json.dumps(auth_msg))
+            await self._ws_connection.send(json_dumps(auth_msg))
             logger.debug(f"[{self.exchange_code}] 发送认证消息")
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 发送认证消息失败: {e}")
@@ -75,15 +113,7 @@ class AsterPositionWebSocket(PositionWebSocketStream):
         发送仓位订阅消息
         """
         try:
-            # Aster订阅消息格式（需要根据实际API文档调整）
-            subscribe_msg = {
-                "method": "subscribe",
-                "params": {
-                    "channel": "positions"
-                }
-            }
-
-            await self._ws_connection.send(json.dumps(subscribe_msg))
+            await self._ws_connection.send(_SUBSCRIBE_POSITIONS_MSG)
             logger.debug(f"[{self.exchange_code}] 发送仓位订阅消息")
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 发送订阅消息失败: {e}")
@@ -97,43 +127,46 @@ class AsterPositionWebSocket(PositionWebSocketStream):
         """
         try:
             method = message.get("method")
+            handler = self._method_handlers.get(method)
 
-            if method == "auth":
-                # 认证响应
-                if message.get("result") is True:
-                    logger.info(f"[{self.exchange_code}] 认证成功")
-                    self._auth_sent = True
-                    # 认证成功后发送订阅消息
-                    await self._send_subscription_message()
-                else:
-                    logger.error(f"[{self.exchange_code}] 认证失败: {message.get('error')}")
-
-            elif method == "subscribe":
-                # 订阅响应
-                if message.get("result") is True:
-                    logger.info(f"[{self.exchange_code}] 仓位订阅成功")
-                else:
-                    logger.error(f"[{self.exchange_code}] 仓位订阅失败: {message.get('error')}")
+            if handler is not None:
+                await handler(message)
 
             elif message.get("channel") == "positions":
                 # 仓位数据更新
                 data = message.get("data", [])
                 if data:
-                    logger.debug(f"[{self.exchange_code}] 收到 {len(data)} 个仓位更新")
+                    logger.debug("[{}] 收到 {} 个仓位更新", self.exchange_code, len(data))
                     await self._handle_positions_update(data)
 
-            elif method == "ping":
-                # ping消息，回复pong
-                pong_msg = {"method": "pong"}
-                await self._ws_connection.send(json.dumps(pong_msg))
-                logger.debug(f"[{self.exchange_code}] 回复pong")
-
             else:
-                logger.debug(f"[{self.exchange_code}] 未知消息类型: {method}")
+                logger.debug("[{}] 未知消息类型: {}", self.exchange_code, method)
 
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 处理消息异常: {e}")
 
+    async def _on_auth_message(self, message: dict):
+        """认证响应"""
+        if message.get("result") is True:
+            logger.info(f"[{self.exchange_code}] 认证成功")
+            self._set_authenticated(True)
+            # 认证成功后发送订阅消息
+            await self._send_subscription_message()
+        else:
+            logger.error(f"[{self.exchange_code}] 认证失败: {message.get('error')}")
+
+    async def _on_subscribe_message(self, message: dict):
+        """订阅响应"""
+        if message.get("result") is True:
+            logger.info(f"[{self.exchange_code}] 仓位订阅成功")
+        else:
+            logger.error(f"[{self.exchange_code}] 仓位订阅失败: {message.get('error')}")
+
+    async def _on_ping_message(self, message: dict):
+        """ping消息，回复pong"""
+        await self._ws_connection.send(_PONG_MSG)
+        logger.debug(f"[{self.exchange_code}] 回复pong")
+
     async def _handle_positions_update(self, positions_data: list):
         """
         处理仓位更新
@@ -145,9 +178,11 @@ class AsterPositionWebSocket(PositionWebSocketStream):
         这里假设有一个标准格式
         """
         try:
-            for position_data in positions_data:
-                # 过滤掉空仓位
-                if float(position_data.get("size", 0)) == 0:
+            # 先按原始值剔除常见的空仓位写法, 无需逐个转 float
+            non_empty = [p for p in positions_data if p.get("size") not in _EMPTY_SIZES]
+            for position_data in non_empty:
+                # 过滤掉空仓位 (如 "0.000" 等非常规写法)
+                if get_float(position_data, "size") == 0:
                     continue
 
                 # 转换为标准格式
@@ -168,28 +203,21 @@ class AsterPositionWebSocket(PositionWebSocketStream):
             BinancePositionDetail: 标准化的仓位详情
         """
         try:
+            update_time = position_data.get("timestamp")
+            if update_time is None:
+                update_time = int(time.time() * 1000)
             # 将Aster仓位数据转换为BinancePositionDetail格式
-            # 这里需要根据Aster的实际数据格式进行转换
-            converted_data = {
-                "symbol": position_data.get("symbol", ""),
-                "positionAmt": position_data.get("size", 0),
-                "entryPrice": position_data.get("entry_price", 0),
-                "markPrice": position_data.get("mark_price", 0),
-                "unRealizedProfit": position_data.get("unrealized_pnl", 0),
-                "notional": position_data.get("notional", 0),
-                "leverage": position_data.get("leverage", 1),
-                "liquidationPrice": position_data.get("liquidation_price", 0),
-                "updateTime": position_data.get("timestamp", int(time.time() * 1000))
-            }
+            get = position_data.get
+            converted_data = {key: get(aster_key, default)
+                              for key, aster_key, default in _ASTER_POSITION_FIELDS}
+            converted_data["updateTime"] = update_time
 
             return BinancePositionDetail(converted_data, exchange_code=self.exchange_code)
 
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 转换仓位数据异常: {e}")
             # 返回一个空的仓位对象
-            empty_position = BinancePositionDetail({})
-            empty_position.exchange_code = self.exchange_code
-            return empty_position
+            return self._empty_position(BinancePositionDetail)
 
     async def _listen_websocket(self):
         """持续监听 WebSocket 消息（支持自动重连）"""
@@ -205,6 +233,7 @@ class AsterPositionWebSocket(PositionWebSocketStream):
 
                 async with websockets.connect(
                     self.ws_url,
+                    ssl=shared_ssl_context(),
                     ping_interval=20,
                     ping_timeout=5
                 ) as websocket:
@@ -218,24 +247,34 @@ class AsterPositionWebSocket(PositionWebSocketStream):
                     if retry_count > 0:
                         logger.debug(f"[{self.exchange_code}] 重连成功！")
                     retry_count = 0
-                    self._auth_sent = False
+                    self._set_authenticated(False)
+
+                    # 每个连接使用独立的有界队列, 队列满时 put 阻塞形成背压
+                    rx_queue = asyncio.Queue(maxsize=self._rx_queue_size)
+                    self._process_task = asyncio.create_task(self._process_messages(rx_queue))
 
                     # 持续接收消息
-                    while self._running:
-                        try:
-                            message = await asyncio.wait_for(websocket.recv(), timeout=10)
-                            data = json.loads(message)
-                            await self._handle_message(data)
-
-                        except asyncio.TimeoutError:
-                            logger.debug(f"[{self.exchange_code}] WebSocket 超时，发送 ping...")
-                            await websocket.ping()
-                        except websockets.exceptions.ConnectionClosed:
-                            logger.warning(f"[{self.exchange_code}] WebSocket 连接关闭，准备重连...")
-                            break
-                        except Exception as e:
-                            logger.error(f"[{self.exchange_code}] 处理消息异常: {e}")
-                            break
+                    try:
+                        while self._running:
+                            try:
+                                message = await asyncio.wait_for(websocket.recv(), timeout=10)
+                                await rx_queue.put(message)
+
+                            except asyncio.TimeoutError:
+                                logger.debug(f"[{self.exchange_code}] WebSocket 超时，发送 ping...")
+                                await websocket.ping()
+                            except websockets.exceptions.ConnectionClosed:
+                                logger.warning(f"[{self.exchange_code}] WebSocket 连接关闭，准备重连...")
+                                break
+                            except Exception as e:
+                                logger.error(f"[{self.exchange_code}] 接收消息异常: {e}")
+                                break
+                    finally:
+                        if self._running:
+                            # 连接断开但仍在运行: 已收到的帧处理完再重连, 不丢弃仓位/订单更新
+                            await self._drain_process_task(rx_queue)
+                        else:
+                            await self._cancel_process_task()
 
             except Exception as e:
                 if not self._running:
@@ -243,7 +282,7 @@ class AsterPositionWebSocket(PositionWebSocketStream):
                     return
 
                 # 连接失败，重置认证状态
-                self._auth_sent = False
+                self._set_authenticated(False)
 
                 if "no pong" in str(e) or "ConnectionClosed" in str(type(e).__name__):
                     logger.warning(f"[{self.exchange_code}] WebSocket连接断开: {e}")
@@ -259,17 +298,48 @@ class AsterPositionWebSocket(PositionWebSocketStream):
 
             finally:
                 self._ws_connection = None
-                self._auth_sent = False
+                self._set_authenticated(False)
 
         logger.debug(f"[{self.exchange_code}] WebSocket监听线程退出")
 
+    async def _process_messages(self, rx_queue: asyncio.Queue):
+        """从接收队列取出原始帧, 解析并分发"""
+        while True:
+            message = await rx_queue.get()
+            if message is _RX_QUEUE_END:
+                return
+            try:
+                await self._handle_message(json_loads(message))
+            except Exception as e:
+                logger.error(f"[{self.exchange_code}] 处理消息异常: {e}")
+
+    async def _drain_process_task(self, rx_queue: asyncio.Queue):
+        """放入结束标记并等待解析任务处理完队列中剩余的帧"""
+        task = self._process_task
+        if task:
+            if rx_queue.qsize():
+                logger.debug("[{}] 连接断开, 处理队列中剩余的 {} 帧", self.exchange_code, rx_queue.qsize())
+            await rx_queue.put(_RX_QUEUE_END)
+            await task
+            self._process_task = None
+
+    async def _cancel_process_task(self):
+        """取消解析任务, 仅在 stop() 时使用"""
+        task, self._process_task = self._process_task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
     async def start(self):
         """启动 WebSocket 连接"""
         if self._running:
             logger.warning(f"[{self.exchange_code}] 仓位WebSocket 已在运行")
             return
 
-        if not all([self.api_key, self.secret]):
+        if not (self.api_key and self.secret):
             logger.error(f"[{self.exchange_code}] 缺少必要的API凭据，无法启动私有数据流")
             return
 
@@ -297,5 +367,6 @@ class AsterPositionWebSocket(PositionWebSocketStream):
                 await self._listen_task
             except asyncio.CancelledError:
                 pass
+        await self._cancel_process_task()
 
         logger.debug(f"[{self.exchange_code}] 仓位WebSocket 已停止")
\ No newline at end of file
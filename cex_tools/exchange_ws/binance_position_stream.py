@@ -8,7 +8,9 @@
 """
 import asyncio
 import json
+import sys
 import threading
+from operator import itemgetter
 from loguru import logger
 from typing import Optional, Dict, Any
 import websockets.client
@@ -17,6 +19,14 @@ from cex_tools.exchange_model.order_update_event_model import OrderUpdateEvent
 from cex_tools.exchange_ws.position_stream import PositionWebSocketStream
 from cex_tools.exchange_model.position_model import BinancePositionDetail
 from binance.um_futures import UMFutures
+from utils.json_utils import json_loads
+from utils.ssl_utils import shared_ssl_context
+
+# ORDER_TRADE_UPDATE 推送 o 对象中必有的字段, 顺序与 _handle_order_update 的解包一致
+_order_fields = itemgetter('s', 'c', 'i', 't', 'S', 'o', 'X', 'q', 'p', 'ap', 'l', 'z', 'L', 'R', 'ps', 'T')
+
+# 用户数据流中无需处理的事件帧前缀 (TRADE_LITE 与 ORDER_TRADE_UPDATE 成交信息重复, 每笔成交都会推送)
+_IGNORED_EVENT_PREFIXES = ('{"e":"TRADE_LITE"',)
 
 
 class BinancePositionWebSocket(PositionWebSocketStream):
@@ -55,6 +65,9 @@ class BinancePositionWebSocket(PositionWebSocketStream):
             "wss://stream.binancefuture.com/ws" if sandbox
             else "wss://fstream.binance.com/ws"
         )
+        # 接收缓冲的最大帧数; 缓冲满时库停止读取 socket, 由 TCP 窗口向服务端施加背压,
+        # 回调处理过慢时会表现为读取停顿而不是内存无限增长
+        self._max_queue = kwargs.get('max_queue', 32)
 
         # 连接管理
         self.listen_key: Optional[str] = None
@@ -62,10 +75,18 @@ class BinancePositionWebSocket(PositionWebSocketStream):
         self._listen_task: Optional[asyncio.Task] = None
         self._renew_task: Optional[asyncio.Task] = None  # listenKey续期任务
         self._ws_thread: Optional[threading.Thread] = None
+        self._ws_loop: Optional[asyncio.AbstractEventLoop] = None  # WebSocket线程的事件循环, 连接只能在其上关闭
+        self._close_timeout = 10
 
         # 状态管理
         self._running = False
         self._last_positions: Dict[str, BinancePositionDetail] = {}
+        # 事件类型 e -> 处理函数, 每帧只做一次字典查找
+        self._event_handlers = {
+            'ACCOUNT_UPDATE': self._on_account_update_event,
+            'ORDER_TRADE_UPDATE': self._on_order_trade_update_event,
+            'MARGIN_CALL': self._on_margin_call_event,
+        }
 
     async def _get_listen_key(self) -> Optional[str]:
         """
@@ -138,13 +159,26 @@ class BinancePositionWebSocket(PositionWebSocketStream):
         重启WebSocket连接
         """
         logger.info(f"[{self.exchange_code}] 重启WebSocket连接")
-        # 这里会触发重连机制
-        if self._ws_connection:
-            try:
-                await self._ws_connection.close()
-            except:
-                pass
-            self._ws_connection = None
+        # 关闭当前连接, 接收循环退出后由 _run_websocket_async 重连
+        await self._close_ws_connection()
+
+    async def _close_ws_connection(self):
+        """
+        关闭WebSocket连接
+        连接属于WebSocket线程的事件循环, 需调度到该循环上关闭, 阻塞中的 recv 随之抛出 ConnectionClosed 退出
+        """
+        ws, ws_loop = self._ws_connection, self._ws_loop
+        self._ws_connection = None
+        if ws is None:
+            return
+        try:
+            if ws_loop is None or ws_loop is asyncio.get_running_loop():
+                await ws.close()
+            elif ws_loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(ws.close(), ws_loop)
+                await asyncio.wait_for(asyncio.wrap_future(future), timeout=self._close_timeout + 1)
+        except Exception as e:
+            logger.warning(f"[{self.exchange_code}] 关闭WebSocket连接异常: {e}")
 
     async def _handle_order_update(self, data):
         """
@@ -185,29 +219,32 @@ class BinancePositionWebSocket(PositionWebSocketStream):
               }
         """
         try:
-            # 转换订单类型
-            order_type_str = data.get('o', 'MARKET')
-            # 转换订单状态
-            status_str = data.get('X', 'NEW')
+            (symbol, client_order_id, order_id, trade_id, side, order_type, status,
+             qty, price, avg_price, last_qty, acc_qty, last_price,
+             reduce_only, position_side, trade_time) = _order_fields(data)
+        except KeyError as e:
+            logger.error(f"[{self.exchange_code}] 订单更新缺少字段 {e}: {data}")
+            return None
+        try:
             # 创建订单事件
             event = OrderUpdateEvent(
                 exchange_code=self.exchange_code,
-                symbol=data.get('s', ''),
-                client_order_id=data.get('c', ''),
-                order_id=data.get('i', ''),
-                trade_id=data.get('t', ''),
-                side=data.get('S', ''),
-                order_type=order_type_str,
-                original_quantity=float(data.get('q', 0)),
-                price=float(data.get('p', 0)),
-                avg_price=float(data.get('ap', 0)),
-                order_status=status_str,
-                order_last_filled_quantity=float(data.get('l', 0)),
-                order_filled_accumulated_quantity=float(data.get('z', 0)),
-                last_filled_price=float(data.get('L', 0)),
-                reduce_only=data.get('R', False),
-                position_side_mode=data.get('ps', ''),
-                timestamp=data.get('T', 0)
+                symbol=sys.intern(symbol),
+                client_order_id=client_order_id,
+                order_id=order_id,
+                trade_id=trade_id,
+                side=sys.intern(side),
+                order_type=sys.intern(order_type),
+                original_quantity=float(qty or 0),
+                price=float(price or 0),
+                avg_price=float(avg_price or 0),
+                order_status=sys.intern(status),
+                order_last_filled_quantity=float(last_qty or 0),
+                order_filled_accumulated_quantity=float(acc_qty or 0),
+                last_filled_price=float(last_price or 0),
+                reduce_only=reduce_only,
+                position_side_mode=position_side,
+                timestamp=trade_time
             )
             await self.on_order_update_callback(event)
         except Exception as e:
@@ -223,6 +260,18 @@ class BinancePositionWebSocket(PositionWebSocketStream):
         """
         await self.on_account_callback(data)
 
+    async def _on_account_update_event(self, data: dict):
+        """账户更新消息，包含仓位信息"""
+        await self._handle_account_update(data.get('a', {}))
+
+    async def _on_order_trade_update_event(self, data: dict):
+        """订单更新消息"""
+        await self._handle_order_update(data.get('o', {}))
+
+    async def _on_margin_call_event(self, data: dict):
+        """保证金催缴消息"""
+        logger.warning(f"[{self.exchange_code}] 收到保证金催缴: {data}")
+
     async def _handle_websocket_message(self, message: str):
         """
         处理WebSocket消息
@@ -231,23 +280,18 @@ class BinancePositionWebSocket(PositionWebSocketStream):
             message: WebSocket消息字符串
         """
         try:
-            data = json.loads(message)
+            # 不处理的高频事件按原始前缀直接丢弃, 省去整帧 JSON 解析
+            if message.startswith(_IGNORED_EVENT_PREFIXES):
+                return
+            data = json_loads(message)
             event_type = data.get('e')
+            handler = self._event_handlers.get(event_type)
 
-            if event_type == 'ACCOUNT_UPDATE':
-                # 账户更新消息，包含仓位信息
-                # logger.debug(f"[{self.exchange_code}] 收到账户更新消息")
-                await self._handle_account_update(data.get('a', {}))
-            elif event_type == 'ORDER_TRADE_UPDATE':
-                # 订单更新消息，暂时不处理
-                # logger.debug(f"[{self.exchange_code}] 收到Order更新消息")
-                await self._handle_order_update(data.get('o', {}))
-            elif event_type == 'MARGIN_CALL':
-                # 保证金催缴消息
-                logger.warning(f"[{self.exchange_code}] 收到保证金催缴: {data}")
+            if handler is not None:
+                await handler(data)
             else:
                 # 其他消息类型
-                logger.debug(f"[{self.exchange_code}] 收到其他类型消息: {event_type}")
+                logger.debug("[{}] 收到其他类型消息: {}", self.exchange_code, event_type)
 
         except json.JSONDecodeError as e:
             logger.error(f"[{self.exchange_code}] 解析WebSocket消息失败: {e}")
@@ -280,7 +324,10 @@ class BinancePositionWebSocket(PositionWebSocketStream):
                 ws_url = f"{self.base_ws_url}/{self.listen_key}"
                 async with websockets.client.connect(
                     ws_url,
-                    close_timeout=10,
+                    ssl=shared_ssl_context(),
+                    compression=None,  # 帧很小, 不协商 permessage-deflate, 省去逐帧解压
+                    max_queue=self._max_queue,
+                    close_timeout=self._close_timeout,
                     ping_interval=20,
                     ping_timeout=10
                 ) as ws:
@@ -292,16 +339,13 @@ class BinancePositionWebSocket(PositionWebSocketStream):
                         logger.debug(f"[{self.exchange_code}] 重连成功！")
                     retry_count = 0
 
-                    # 持续接收消息
+                    # 持续接收消息, 心跳由 ping_interval 自动处理
+                    # stop()/重启时通过 _close_ws_connection 在本线程的循环上关闭连接, 阻塞中的 recv 会抛出 ConnectionClosed 退出循环
                     while self._running:
                         try:
-                            message = await asyncio.wait_for(ws.recv(), timeout=30)
+                            message = await ws.recv()
                             await self._handle_websocket_message(message)
 
-                        except asyncio.TimeoutError:
-                            # 超时，发送ping（websockets库会自动处理ping）
-                            # logger.debug(f"[{self.exchange_code}] WebSocket接收超时")
-                            continue
                         except Exception as e:
                             if self._running:
                                 logger.warning(f"[{self.exchange_code}] WebSocket接收消息异常: {e}")
@@ -340,10 +384,12 @@ class BinancePositionWebSocket(PositionWebSocketStream):
                 asyncio.set_event_loop(loop)
 
             # 在事件循环中运行异步WebSocket任务
+            self._ws_loop = loop
             loop.run_until_complete(self._run_websocket_async())
         except Exception as e:
             logger.error(f"[{self.exchange_code}] WebSocket线程异常: {e}")
         finally:
+            self._ws_loop = None
             logger.debug(f"[{self.exchange_code}] WebSocket线程退出")
 
     async def start(self):
@@ -352,7 +398,7 @@ class BinancePositionWebSocket(PositionWebSocketStream):
             logger.warning(f"[{self.exchange_code}] 仓位WebSocket已在运行")
             return
 
-        if not all([self.api_key, self.secret]):
+        if not (self.api_key and self.secret):
             logger.error(f"[{self.exchange_code}] 缺少API密钥，无法启动仓位监听")
             return
 
@@ -416,12 +462,7 @@ class BinancePositionWebSocket(PositionWebSocketStream):
                 pass
 
         # 关闭WebSocket连接
-        if self._ws_connection:
-            try:
-                await self._ws_connection.close()
-            except:
-                pass
-            self._ws_connection = None
+        await self._close_ws_connection()
 
         # 等待线程结束
         if self._ws_thread and self._ws_thread.is_alive():
@@ -7,36 +7,49 @@
 @Time        : 2025/10/2 20:50
 """
 import asyncio
-import json
 import time
 import aiohttp
 import websockets
 from loguru import logger
 from typing import Optional, Dict
 
-from cex_tools.exchange_ws.orderbook_stream import OrderBookStream, OrderBookData
+from cex_tools.exchange_ws.orderbook_stream import OrderBookStream, OrderBookData, LocalOrderBookSide
+from utils.json_utils import json_loads
+from utils.ssl_utils import shared_ssl_context
+
+_DEPTH_URL = "https://fapi.binance.com/fapi/v1/depth"
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10)
 
 
 class BinanceOrderBookStreamDirect(OrderBookStream):
     """直接使用 websockets 实现的 Binance 订单簿流，维护本地订单簿"""
 
-    def __init__(self, api_key: str = None, secret: str = None):
+    def __init__(self, api_key: str = None, secret: str = None, top_k: int = 20):
+        """
+        :param top_k: 发布订单簿时每边保留的档位数 (本地仍维护完整订单簿)
+        """
         super().__init__("Binance")
         self.api_key = api_key
         self.secret = secret
+        self.top_k = top_k
         self._ws_connection = None
         self._listen_task: Optional[asyncio.Task] = None
+        # 快照请求复用同一个 HTTP 会话, 重新初始化订单簿时不必重新建立 TCP/TLS 连接
+        self._session: Optional[aiohttp.ClientSession] = None
 
         # 本地订单簿维护
-        self._local_orderbooks: Dict[str, Dict] = {}  # pair -> {bids: {price: qty}, asks: {price: qty}}
+        self._local_orderbooks: Dict[str, Dict[str, LocalOrderBookSide]] = {}  # pair -> {bids: 买盘, asks: 卖盘}
         self._initialized: Dict[str, bool] = {}  # pair -> initialized flag
         self.last_update_id = None  # 记录最后处理的消息ID
+        # 流名称 -> 交易对, 订阅时生成, 收到推送时直接查表而不必解析流名称
+        self._stream_to_pair: Dict[str, str] = {}
 
     def subscribe(self, pair: str, callback=None):
         """订阅交易对"""
         if not pair.endswith("USDT") and not pair.endswith("USDC"):
             pair += "USDT"
         super().subscribe(pair, callback)
+        self._stream_to_pair[self._get_stream_name(pair)] = pair
 
     def _get_stream_name(self, pair: str) -> str:
         """
@@ -45,23 +58,30 @@ class BinanceOrderBookStreamDirect(OrderBookStream):
         """
         return f"{pair.lower()}@depth@100ms"
 
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """获取 HTTP 会话, 首次使用或已关闭时创建"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=shared_ssl_context()),
+                                                  timeout=_HTTP_TIMEOUT)
+        return self._session
+
     async def _fetch_orderbook_snapshot(self, pair: str) -> Optional[dict]:
         """
         从 REST API 获取订单簿快照
         :param pair: 交易对
         :return: {"lastUpdateId": int, "bids": [...], "asks": [...]}
         """
-        url = f"https://fapi.binance.com/fapi/v1/depth?symbol={pair.lower()}&limit=1000"
+        url = f"{_DEPTH_URL}?symbol={pair.lower()}&limit=1000"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.debug(f"[{self.exchange_name}] {pair} 获取快照成功，lastUpdateId={data.get('lastUpdateId')}")
-                        return data
-                    else:
-                        logger.error(f"[{self.exchange_name}] {pair} 获取快照失败: HTTP {response.status}")
-                        return None
+            session = self._ensure_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    logger.debug(f"[{self.exchange_name}] {pair} 获取快照成功，lastUpdateId={data.get('lastUpdateId')}")
+                    return data
+                else:
+                    logger.error(f"[{self.exchange_name}] {pair} 获取快照失败: HTTP {response.status}")
+                    return None
         except Exception as e:
             logger.error(f"[{self.exchange_name}] {pair} 获取快照异常: {e}")
             return None
@@ -79,21 +99,20 @@ class BinanceOrderBookStreamDirect(OrderBookStream):
                 return
 
             # 初始化本地订单簿
-            self._local_orderbooks[pair] = {
-                "bids": {},
-                "asks": {}
-            }
+            bids = LocalOrderBookSide(descending=True)
+            asks = LocalOrderBookSide(descending=False)
 
             # 加载快照数据
-            for price, qty in snapshot.get("bids", []):
-                self._local_orderbooks[pair]["bids"][float(price)] = float(qty)
-
-            for price, qty in snapshot.get("asks", []):
-                self._local_orderbooks[pair]["asks"][float(price)] = float(qty)
+            bids.load(snapshot.get("bids", []))
+            asks.load(snapshot.get("asks", []))
+            self._local_orderbooks[pair] = {
+                "bids": bids,
+                "asks": asks
+            }
 
             logger.debug(f"[{self.exchange_name}] {pair} 本地订单簿初始化完成，"
-                       f"bids={len(self._local_orderbooks[pair]['bids'])}, "
-                       f"asks={len(self._local_orderbooks[pair]['asks'])}")
+                       f"bids={len(bids)}, "
+                       f"asks={len(asks)}")
 
             # 标记为已初始化
             self._initialized[pair] = True
@@ -112,25 +131,17 @@ class BinanceOrderBookStreamDirect(OrderBookStream):
         :param event: WebSocket 事件数据
         """
         try:
-            # 更新 bids
+            orderbook_dict = self._local_orderbooks[pair]
+
+            # 更新 bids, 数量为 0 时删除该价格层级
+            update = orderbook_dict["bids"].update
             for price, qty in event.get("b", []):
-                price = float(price)
-                qty = float(qty)
-                if qty == 0:
-                    # 删除该价格层级
-                    self._local_orderbooks[pair]["bids"].pop(price, None)
-                else:
-                    # 更新/添加该价格层级
-                    self._local_orderbooks[pair]["bids"][price] = qty
+                update(float(price), float(qty))
 
             # 更新 asks
+            update = orderbook_dict["asks"].update
             for price, qty in event.get("a", []):
-                price = float(price)
-                qty = float(qty)
-                if qty == 0:
-                    self._local_orderbooks[pair]["asks"].pop(price, None)
-                else:
-                    self._local_orderbooks[pair]["asks"][price] = qty
+                update(float(price), float(qty))
             self.last_update_id = event['u']  # 更新最后处理的消息ID
             # 生成并推送 OrderBookData
             self._publish_orderbook(pair)
@@ -149,13 +160,9 @@ class BinanceOrderBookStreamDirect(OrderBookStream):
             if not orderbook_dict:
                 return
 
-            # 排序并转换为列表格式
-            bids = sorted(orderbook_dict["bids"].items(), key=lambda x: x[0], reverse=True)
-            asks = sorted(orderbook_dict["asks"].items(), key=lambda x: x[0])
-
-            # 转换为 [[price, qty], ...] 格式
-            bids_list = [[price, qty] for price, qty in bids]
-            asks_list = [[price, qty] for price, qty in asks]
+            # 档位已按价格有序维护, 只取最优的 top_k 档转换为 [[price, qty], ...] 格式
+            bids_list = orderbook_dict["bids"].to_list(self.top_k)
+            asks_list = orderbook_dict["asks"].to_list(self.top_k)
 
             # 创建 OrderBookData
             orderbook = OrderBookData(
@@ -191,7 +198,7 @@ class BinanceOrderBookStreamDirect(OrderBookStream):
                 else:
                     logger.debug(f"[{self.exchange_name}] 重连WebSocket (第{retry_count}次)")
 
-                async with websockets.connect(ws_url, ping_interval=20, ping_timeout=5) as websocket:
+                async with websockets.connect(ws_url, ssl=shared_ssl_context(), ping_interval=20, ping_timeout=5) as websocket:
                     self._ws_connection = websocket
                     logger.debug(f"[{self.exchange_name}] WebSocket 连接成功")
 
@@ -203,7 +210,7 @@ class BinanceOrderBookStreamDirect(OrderBookStream):
                     while self._running:
                         try:
                             message = await asyncio.wait_for(websocket.recv(), timeout=5)
-                            data = json.loads(message)
+                            data = json_loads(message)
 
                             # Binance 返回格式: {"stream": "btcusdt@depth@100ms", "data": {...}}
                             if "data" in data and "stream" in data:
@@ -254,11 +261,9 @@ class BinanceOrderBookStreamDirect(OrderBookStream):
         :param data: 订单簿增量数据
         """
         try:
-            # 从流名称提取交易对
-            pair = stream.split("@")[0].upper()
-
             # 只处理订阅的交易对
-            if pair not in self.orderbook_callbacks:
+            pair = self._stream_to_pair.get(stream)
+            if pair is None:
                 return
 
             # 如果还未初始化，先初始化
@@ -306,4 +311,9 @@ class BinanceOrderBookStreamDirect(OrderBookStream):
             except asyncio.CancelledError:
                 pass
 
+        # 关闭 HTTP 会话
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
         logger.debug(f"[{self.exchange_name}] WebSocket 已停止")
\ No newline at end of file
@@ -15,6 +15,11 @@ from loguru import logger
 import websockets
 
 from cex_tools.exchange_ws.orderbook_stream import OrderBookStream, OrderBookData
+from utils.json_utils import json_loads
+from utils.ssl_utils import shared_ssl_context
+
+# 心跳消息内容固定, 只序列化一次
+_PING_MSG = json.dumps({"op": "ping"})
 
 
 class BybitOrderBookStreamAsync(OrderBookStream):
@@ -98,12 +103,13 @@ class BybitOrderBookStreamAsync(OrderBookStream):
                 sorted_bids = sorted(local_book["bids"], key=lambda x: x[0], reverse=True)[:50]
                 sorted_asks = sorted(local_book["asks"], key=lambda x: x[0])[:50]
 
-                # 创建订单簿对象
+                # 创建订单簿对象, 仅在推送缺少 ts 时才读取本地时间
+                ts = message.get("ts")
                 orderbook = OrderBookData(
                     pair=symbol,
                     bids=sorted_bids,
                     asks=sorted_asks,
-                    timestamp=int(message.get("ts", time.time() * 1000)) / 1000
+                    timestamp=int(ts) / 1000 if ts is not None else time.time()
                 )
 
                 # 触发回调
@@ -164,6 +170,7 @@ class BybitOrderBookStreamAsync(OrderBookStream):
                 import websockets.sync.client
                 ws = websockets.sync.client.connect(
                     self.ws_url,
+                    ssl=shared_ssl_context(),
                     close_timeout=10,
                     open_timeout=15
                 )
@@ -184,48 +191,48 @@ class BybitOrderBookStreamAsync(OrderBookStream):
                     logger.debug(f"[Bybit] 重连成功！")
                 retry_count = 0
 
-                # 心跳定时器
-                last_ping_time = time.time()
-                ping_interval = 20  # 每20秒发送ping
-
-                # 消息循环
-                for raw_message in ws:
-                    if not self._running:
-                        logger.debug("[Bybit] 收到停止信号，退出消息循环")
-                        return
+                # 心跳由独立线程按固定间隔发送, 消息循环中不再逐帧读取时钟
+                heartbeat_stop = threading.Event()
+                threading.Thread(
+                    target=self._heartbeat_loop,
+                    args=(ws, heartbeat_stop),
+                    daemon=True,
+                    name="BybitHeartbeatThread"
+                ).start()
+
+                try:
+                    # 消息循环
+                    for raw_message in ws:
+                        if not self._running:
+                            logger.debug("[Bybit] 收到停止信号，退出消息循环")
+                            return
 
-                    # 发送心跳
-                    if time.time() - last_ping_time > ping_interval:
                         try:
-                            ws.send(json.dumps({"op": "ping"}))
-                            last_ping_time = time.time()
+                            message = json_loads(raw_message)
+
+                            # 处理不同类型的消息
+                            if "op" in message:
+                                # 操作响应消息
+                                op = message["op"]
+                                if op == "subscribe":
+                                    if message.get("success"):
+                                        logger.debug(f"[Bybit] 订阅成功")
+                                    else:
+                                        logger.error(f"[Bybit] 订阅失败: {message}")
+                                elif op == "pong":
+                                    # pong响应，忽略
+                                    pass
+                            elif "topic" in message:
+                                # 数据消息
+                                self._on_orderbook_message(message)
+
+                        except json.JSONDecodeError as e:
+                            logger.warning(f"[Bybit] JSON解析失败: {e}")
                         except Exception as e:
-                            logger.warning(f"[Bybit] 发送ping失败: {e}")
-
-                    try:
-                        message = json.loads(raw_message)
-
-                        # 处理不同类型的消息
-                        if "op" in message:
-                            # 操作响应消息
-                            op = message["op"]
-                            if op == "subscribe":
-                                if message.get("success"):
-                                    logger.debug(f"[Bybit] 订阅成功")
-                                else:
-                                    logger.error(f"[Bybit] 订阅失败: {message}")
-                            elif op == "pong":
-                                # pong响应，忽略
-                                pass
-                        elif "topic" in message:
-                            # 数据消息
-                            self._on_orderbook_message(message)
-
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"[Bybit] JSON解析失败: {e}")
-                    except Exception as e:
-                        logger.error(f"[Bybit] 处理消息异常: {e}")
-                        logger.exception(e)
+                            logger.error(f"[Bybit] 处理消息异常: {e}")
+                            logger.exception(e)
+                finally:
+                    heartbeat_stop.set()
 
             except Exception as e:
                 if not self._running:
@@ -265,6 +272,16 @@ class BybitOrderBookStreamAsync(OrderBookStream):
         self._running = False
         logger.debug("[Bybit] WebSocket线程退出")
 
+    @staticmethod
+    def _heartbeat_loop(ws, stop_event: threading.Event, ping_interval: float = 20):
+        """每 ping_interval 秒发送一次 ping, 直到 stop_event 被置位或发送失败"""
+        while not stop_event.wait(ping_interval):
+            try:
+                ws.send(_PING_MSG)
+            except Exception as e:
+                logger.warning(f"[Bybit] 发送ping失败: {e}")
+                return
+
     async def start(self):
         """启动WebSocket连接"""
         if self._running:
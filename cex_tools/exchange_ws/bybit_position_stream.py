@@ -16,9 +16,21 @@ import hashlib
 import hmac
 import base64
 
+from cex_tools.exchange_model.base_model import get_float
 from cex_tools.exchange_ws.position_stream import PositionWebSocketStream
 from cex_tools.exchange_model.position_model import BybitPositionDetail
 from cex_tools.exchange_model.position_event_model import PositionEventType
+from utils.json_utils import json_loads
+from utils.ssl_utils import shared_ssl_context
+
+# 固定内容的消息, 模块加载时序列化一次, 重连时直接发送
+_SUBSCRIBE_POSITION_MSG = json.dumps({
+    "op": "subscribe",
+    "args": [
+        "position.linear"  # 线性合约仓位
+    ]
+})
+_PONG_MSG = json.dumps({"op": "pong"})
 
 
 class BybitPositionWebSocket(PositionWebSocketStream):
@@ -47,7 +59,6 @@ class BybitPositionWebSocket(PositionWebSocketStream):
 
         self._ws_connection = None
         self._listen_task: Optional[asyncio.Task] = None
-        self._auth_sent = False
 
     def _generate_signature(self, expires: int, api_key: str, secret_key: str) -> str:
         """
@@ -96,14 +107,7 @@ class BybitPositionWebSocket(PositionWebSocketStream):
         发送仓位订阅消息
         """
         try:
-            subscribe_msg = {
-                "op": "subscribe",
-                "args": [
-                    "position.linear"  # 线性合约仓位
-                ]
-            }
-
-            await self._ws_connection.send(json.dumps(subscribe_msg))
+            await self._ws_connection.send(_SUBSCRIBE_POSITION_MSG)
             logger.debug(f"[{self.exchange_code}] 发送仓位订阅消息")
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 发送订阅消息失败: {e}")
@@ -122,7 +126,7 @@ class BybitPositionWebSocket(PositionWebSocketStream):
                 # 认证响应
                 if message.get("success") is True:
                     logger.info(f"[{self.exchange_code}] 认证成功")
-                    self._auth_sent = True
+                    self._set_authenticated(True)
                     # 认证成功后发送订阅消息
                     await self._send_subscription_message()
                 else:
@@ -132,7 +136,7 @@ class BybitPositionWebSocket(PositionWebSocketStream):
                 # 仓位数据更新
                 data = message.get("data", [])
                 if data:
-                    logger.debug(f"[{self.exchange_code}] 收到 {len(data)} 个仓位更新")
+                    logger.debug("[{}] 收到 {} 个仓位更新", self.exchange_code, len(data))
                     await self._handle_positions_update(data)
 
             elif topic is None and message.get("op") == "subscribe":
@@ -144,12 +148,11 @@ class BybitPositionWebSocket(PositionWebSocketStream):
 
             elif topic is None and message.get("op") == "ping":
                 # ping消息，回复pong
-                pong_msg = {"op": "pong"}
-                await self._ws_connection.send(json.dumps(pong_msg))
+                await self._ws_connection.send(_PONG_MSG)
                 logger.debug(f"[{self.exchange_code}] 回复pong")
 
             else:
-                logger.debug(f"[{self.exchange_code}] 未知消息: {topic}")
+                logger.debug("[{}] 未知消息: {}", self.exchange_code, topic)
 
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 处理消息异常: {e}")
@@ -198,7 +201,7 @@ class BybitPositionWebSocket(PositionWebSocketStream):
             for position_data in positions_data:
                 # 过滤掉空仓位（需要根据实际情况判断）
                 # Bybit可能通过positionBalance或unrealisedPnl判断是否有仓位
-                position_balance = float(position_data.get("positionBalance", 0))
+                position_balance = get_float(position_data, "positionBalance")
                 if position_balance == 0:
                     # 这可能是一个平仓消息，需要创建空仓位对象
                     position_detail = self._convert_bybit_position(position_data)
@@ -228,9 +231,7 @@ class BybitPositionWebSocket(PositionWebSocketStream):
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 转换仓位数据异常: {e}")
             # 返回一个空的仓位对象
-            empty_position = BybitPositionDetail({})
-            empty_position.exchange_code = self.exchange_code
-            return empty_position
+            return self._empty_position(BybitPositionDetail)
 
     async def _listen_websocket(self):
         """持续监听 WebSocket 消息（支持自动重连）"""
@@ -246,6 +247,7 @@ class BybitPositionWebSocket(PositionWebSocketStream):
 
                 async with websockets.connect(
                     self.ws_url,
+                    ssl=shared_ssl_context(),
                     ping_interval=20,
                     ping_timeout=5
                 ) as websocket:
@@ -259,13 +261,13 @@ class BybitPositionWebSocket(PositionWebSocketStream):
                     if retry_count > 0:
                         logger.debug(f"[{self.exchange_code}] 重连成功！")
                     retry_count = 0
-                    self._auth_sent = False
+                    self._set_authenticated(False)
 
                     # 持续接收消息
                     while self._running:
                         try:
                             message = await asyncio.wait_for(websocket.recv(), timeout=10)
-                            data = json.loads(message)
+                            data = json_loads(message)
                             await self._handle_message(data)
 
                         except asyncio.TimeoutError:
@@ -284,7 +286,7 @@ class BybitPositionWebSocket(PositionWebSocketStream):
                     return
 
                 # 连接失败，重置认证状态
-                self._auth_sent = False
+                self._set_authenticated(False)
 
                 if "no pong" in str(e) or "ConnectionClosed" in str(type(e).__name__):
                     logger.warning(f"[{self.exchange_code}] WebSocket连接断开: {e}")
@@ -300,7 +302,7 @@ class BybitPositionWebSocket(PositionWebSocketStream):
 
             finally:
                 self._ws_connection = None
-                self._auth_sent = False
+                self._set_authenticated(False)
 
         logger.debug(f"[{self.exchange_code}] WebSocket监听线程退出")
 
@@ -310,7 +312,7 @@ class BybitPositionWebSocket(PositionWebSocketStream):
             logger.warning(f"[{self.exchange_code}] 仓位WebSocket 已在运行")
             return
 
-        if not all([self.api_key, self.secret]):
+        if not (self.api_key and self.secret):
             logger.error(f"[{self.exchange_code}] 缺少必要的API凭据，无法启动私有数据流")
             return
 
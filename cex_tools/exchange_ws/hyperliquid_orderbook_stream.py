@@ -14,6 +14,8 @@ from loguru import logger
 from typing import Optional
 
 from cex_tools.exchange_ws.orderbook_stream import OrderBookStream, OrderBookData
+from utils.json_utils import json_loads
+from utils.ssl_utils import shared_ssl_context
 
 
 class HyperliquidOrderBookStream(OrderBookStream):
@@ -81,14 +83,14 @@ class HyperliquidOrderBookStream(OrderBookStream):
                 # 订阅响应
                 method = data.get("method")
                 subscription = data.get("subscription", {})
-                logger.debug(f"[{self.exchange_name}] 订阅响应: {method} - {subscription}")
+                logger.debug("[{}] 订阅响应: {} - {}", self.exchange_name, method, subscription)
 
             elif channel == "l2Book":
                 # 订单簿更新
                 await self._handle_l2book_update(data)
 
             else:
-                logger.debug(f"[{self.exchange_name}] 未知频道: {channel}")
+                logger.debug("[{}] 未知频道: {}", self.exchange_name, channel)
 
         except Exception as e:
             logger.error(f"[{self.exchange_name}] 处理消息异常: {e}")
@@ -179,15 +181,16 @@ class HyperliquidOrderBookStream(OrderBookStream):
 
                 async with websockets.connect(
                     self.ws_url,
+                    ssl=shared_ssl_context(),
                     ping_interval=20,
                     ping_timeout=5
                 ) as websocket:
                     self._ws_connection = websocket
                     logger.debug(f"[{self.exchange_name}] WebSocket 连接成功")
 
-                    # 发送订阅消息
-                    for coin in self.orderbook_callbacks.keys():
-                        await self._send_subscribe_message(coin)
+                    # 发送订阅消息: HyperLiquid 每条消息只能订阅一个币种, 各币种的发送并发进行
+                    await asyncio.gather(*(self._send_subscribe_message(coin)
+                                           for coin in self.orderbook_callbacks.keys()))
 
                     # 重连成功，重置计数器
                     if retry_count > 0:
@@ -198,7 +201,7 @@ class HyperliquidOrderBookStream(OrderBookStream):
                     while self._running:
                         try:
                             message = await asyncio.wait_for(websocket.recv(), timeout=5)
-                            data = json.loads(message)
+                            data = json_loads(message)
                             await self._handle_message(data)
 
                         except asyncio.TimeoutError:
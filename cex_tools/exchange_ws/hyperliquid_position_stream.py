@@ -16,6 +16,16 @@ from typing import Optional
 from cex_tools.exchange_ws.position_stream import PositionWebSocketStream
 from cex_tools.exchange_model.position_model import HyperliquidPositionDetail
 from cex_tools.exchange_model.position_event_model import PositionEventType
+from utils.json_utils import json_loads
+from utils.ssl_utils import shared_ssl_context
+
+# Hyperliquid用户数据订阅 (预先序列化)
+_SUBSCRIBE_USER_MSG = json.dumps({
+    "method": "subscribe",
+    "subscription": {
+        "type": "user"
+    }
+})
 
 
 class HyperliquidPositionWebSocket(PositionWebSocketStream):
@@ -51,15 +61,7 @@ class HyperliquidPositionWebSocket(PositionWebSocketStream):
         发送用户数据订阅消息
         """
         try:
-            # Hyperliquid用户数据订阅
-            subscribe_msg = {
-                "method": "subscribe",
-                "subscription": {
-                    "type": "user"
-                }
-            }
-
-            await self._ws_connection.send(json.dumps(subscribe_msg))
+            await self._ws_connection.send(_SUBSCRIBE_USER_MSG)
             logger.debug(f"[{self.exchange_code}] 发送用户数据订阅消息")
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 发送订阅消息失败: {e}")
@@ -79,7 +81,7 @@ class HyperliquidPositionWebSocket(PositionWebSocketStream):
                 # 订阅响应
                 method = data.get("method")
                 subscription = data.get("subscription", {})
-                logger.debug(f"[{self.exchange_code}] 订阅响应: {method} - {subscription}")
+                logger.debug("[{}] 订阅响应: {} - {}", self.exchange_code, method, subscription)
 
                 if subscription.get("type") == "user":
                     logger.info(f"[{self.exchange_code}] 用户数据订阅成功")
@@ -90,7 +92,7 @@ class HyperliquidPositionWebSocket(PositionWebSocketStream):
                 await self._handle_user_update(data)
 
             else:
-                logger.debug(f"[{self.exchange_code}] 未知频道: {channel}")
+                logger.debug("[{}] 未知频道: {}", self.exchange_code, channel)
 
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 处理消息异常: {e}")
@@ -123,7 +125,7 @@ class HyperliquidPositionWebSocket(PositionWebSocketStream):
         try:
             positions = data.get("positions", [])
             if positions:
-                logger.debug(f"[{self.exchange_code}] 收到 {len(positions)} 个仓位更新")
+                logger.debug("[{}] 收到 {} 个仓位更新", self.exchange_code, len(positions))
                 self._on_positions_update(positions)
 
         except Exception as e:
@@ -146,9 +148,7 @@ class HyperliquidPositionWebSocket(PositionWebSocketStream):
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 转换仓位数据异常: {e}")
             # 返回一个空的仓位对象
-            empty_position = HyperliquidPositionDetail({})
-            empty_position.exchange_code = self.exchange_code
-            return empty_position
+            return self._empty_position(HyperliquidPositionDetail)
 
     async def _listen_websocket(self):
         """持续监听 WebSocket 消息（支持自动重连）"""
@@ -164,6 +164,7 @@ class HyperliquidPositionWebSocket(PositionWebSocketStream):
 
                 async with websockets.connect(
                     self.ws_url,
+                    ssl=shared_ssl_context(),
                     ping_interval=20,
                     ping_timeout=5
                 ) as websocket:
@@ -183,7 +184,7 @@ class HyperliquidPositionWebSocket(PositionWebSocketStream):
                     while self._running:
                         try:
                             message = await asyncio.wait_for(websocket.recv(), timeout=10)
-                            data = json.loads(message)
+                            data = json_loads(message)
                             await self._handle_message(data)
 
                         except asyncio.TimeoutError:
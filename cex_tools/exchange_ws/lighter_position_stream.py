@@ -54,7 +54,7 @@ class LighterPositionWebSocket(PositionWebSocketStream):
             # Lighter账户数据格式可能包含仓位信息
             positions = account_data.get("positions", [])
             if positions:
-                logger.debug(f"[{self.exchange_code}] {account_id} 收到 {len(positions)} 个仓位更新")
+                logger.debug("[{}] {} 收到 {} 个仓位更新", self.exchange_code, account_id, len(positions))
                 self._on_positions_update(positions)
 
         except Exception as e:
@@ -78,9 +78,7 @@ class LighterPositionWebSocket(PositionWebSocketStream):
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 转换仓位数据异常: {e}")
             # 返回一个空的仓位对象
-            empty_position = LighterPositionDetail({})
-            empty_position.exchange_code = self.exchange_code
-            return empty_position
+            return self._empty_position(LighterPositionDetail)
 
     def _run_ws_blocking(self):
         """在独立线程中运行WebSocket（阻塞调用，支持自动重连）"""
@@ -175,7 +173,7 @@ class LighterPositionWebSocket(PositionWebSocketStream):
             logger.warning(f"[{self.exchange_code}] 仓位WebSocket 已在运行")
             return
 
-        if not all([self.api_key, self.secret]):
+        if not (self.api_key and self.secret):
             logger.error(f"[{self.exchange_code}] 缺少必要的API凭据，无法启动用户数据流")
             return
 
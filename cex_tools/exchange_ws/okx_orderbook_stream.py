@@ -15,6 +15,8 @@ from loguru import logger
 import websockets
 
 from cex_tools.exchange_ws.orderbook_stream import OrderBookStream, OrderBookData
+from utils.json_utils import json_loads
+from utils.ssl_utils import shared_ssl_context
 
 
 class OkxOrderBookStreamAsync(OrderBookStream):
@@ -126,7 +128,9 @@ class OkxOrderBookStreamAsync(OrderBookStream):
             updated_asks = sorted(updated_asks, key=lambda x: x[0])[:50]
 
             # 创建订单簿对象
-            timestamp = int(orderbook_data.get("ts", time.time() * 1000)) / 1000
+            # 仅在推送缺少 ts 时才读取本地时间
+            ts = orderbook_data.get("ts")
+            timestamp = int(ts) / 1000 if ts is not None else time.time()
             orderbook = OrderBookData(
                 pair=pair,
                 bids=updated_bids,
@@ -195,6 +199,7 @@ class OkxOrderBookStreamAsync(OrderBookStream):
                 import websockets.sync.client
                 ws = websockets.sync.client.connect(
                     self.ws_url,
+                    ssl=shared_ssl_context(),
                     close_timeout=10,
                     open_timeout=15
                 )
@@ -222,23 +227,23 @@ class OkxOrderBookStreamAsync(OrderBookStream):
                         return
 
                     try:
-                        message = json.loads(raw_message)
+                        message = json_loads(raw_message)
 
                         # 处理不同类型的消息
                         if "event" in message:
                             # 事件消息 (如订阅确认、错误等)
                             event = message["event"]
                             if event == "subscribe":
-                                logger.debug(f"[OKX] 订阅成功: {message.get('arg', {})}")
+                                logger.debug("[OKX] 订阅成功: {}", message.get("arg"))
                             elif event == "error":
                                 logger.error(f"[OKX] 订阅错误: {message}")
                             else:
-                                logger.debug(f"[OKX] 事件消息: {message}")
+                                logger.debug("[OKX] 事件消息: {}", message)
                         elif "arg" in message and "data" in message:
                             # 数据消息 (订单簿更新)
                             self._on_orderbook_update_ws(message)
                         else:
-                            logger.debug(f"[OKX] 未知消息类型: {message}")
+                            logger.debug("[OKX] 未知消息类型: {}", message)
 
                     except json.JSONDecodeError as e:
                         logger.warning(f"[OKX] JSON解析失败: {e}")
@@ -7,7 +7,7 @@
 @Time        : 2025/10/15
 """
 import asyncio
-import json
+import sys
 import time
 import websockets
 from loguru import logger
@@ -15,14 +15,38 @@ from typing import Optional
 import hashlib
 import hmac
 import base64
+from operator import itemgetter
 
 from cex_tools.cex_enum import ExchangeEnum
+from cex_tools.exchange_model.base_model import get_float, okx_inst_id_to_pair, pair_to_symbol
 from cex_tools.exchange_model.order_update_event_model import OrderUpdateEvent
 from cex_tools.exchange_ws.position_stream import PositionWebSocketStream
 from cex_tools.exchange_model.position_model import OkxPositionDetail
 from okx.app import OkxSWAP
 
 from cex_tools.okx_future import OkxFuture
+from utils.json_utils import json_dumps, json_loads
+from utils.ssl_utils import shared_ssl_context
+
+# 订阅参数不随连接变化, 预先序列化
+_SUBSCRIBE_MSG = json_dumps({
+    "op": "subscribe",
+    "args": [{
+            "channel": "account"
+        },
+        {
+            "channel": "positions",
+            "instType": "SWAP"  # 合约类型
+        }, {
+            "channel": "orders",
+            "instType": "SWAP"  # 合约类型
+        }
+    ]
+})
+
+# OKX 订单推送中每条都会携带的字段, 一次 C 级调用全部取出
+_order_fields = itemgetter('instId', 'clOrdId', 'ordId', 'tradeId', 'side', 'ordType', 'state',
+                           'sz', 'fillSz', 'accFillSz', 'reduceOnly', 'posSide', 'uTime')
 
 
 class OkxPositionWebSocket(PositionWebSocketStream):
@@ -60,7 +84,6 @@ class OkxPositionWebSocket(PositionWebSocketStream):
 
         self._ws_connection = None
         self._listen_task: Optional[asyncio.Task] = None
-        self._login_sent = False
 
         # 初始化OKX客户端用于获取合约信息
         try:
@@ -122,7 +145,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
                 ]
             }
 
-            await self._ws_connection.send(json.dumps(login_msg))
+            await self._ws_connection.send(json_dumps(login_msg))
             logger.debug(f"[{self.exchange_code}] 发送登录消息")
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 发送登录消息失败: {e}")
@@ -132,22 +155,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
         发送仓位订阅消息
         """
         try:
-            subscribe_msg = {
-                "op": "subscribe",
-                "args": [{
-                        "channel": "account"
-                    },
-                    {
-                        "channel": "positions",
-                        "instType": "SWAP"  # 合约类型
-                    }, {
-                        "channel": "orders",
-                        "instType": "SWAP"  # 合约类型
-                    }
-                ]
-            }
-
-            await self._ws_connection.send(json.dumps(subscribe_msg))
+            await self._ws_connection.send(_SUBSCRIBE_MSG)
             logger.debug(f"[{self.exchange_code}] 发送仓位订阅消息")
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 发送订阅消息失败: {e}")
@@ -166,7 +174,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
                 code = message.get("code")
                 if code == "0":
                     logger.info(f"[{self.exchange_code}] 登录成功")
-                    self._login_sent = True
+                    self._set_authenticated(True)
                     # 登录成功后发送订阅消息
                     await self._send_subscription_message()
                 else:
@@ -184,7 +192,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
             elif message.get("arg", {}).get("channel") == "orders":
                 # 仓位数据更新
                 data = message.get("data", [])
-                logger.debug(f"[{self.exchange_code}] 收到{len(data)}个订单更新")
+                logger.debug("[{}] 收到{}个订单更新", self.exchange_code, len(data))
                 for d in data:
                     await self._handle_orders_update(d)
             elif message.get("arg", {}).get("channel") == "account":
@@ -197,7 +205,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
                 logger.error(f"[{self.exchange_code}] 收到错误消息: {message}")
 
             else:
-                logger.debug(f"[{self.exchange_code}] 未知消息类型: {message}")
+                logger.debug("[{}] 未知消息类型: {}", self.exchange_code, message)
 
         except Exception as e:
             logger.exception(f"[{self.exchange_code}] 处理消息异常: {e}")
@@ -206,38 +214,40 @@ class OkxPositionWebSocket(PositionWebSocketStream):
         """
             {'instType': 'SWAP', 'instId': 'ETH-USDT-SWAP', 'tgtCcy': '', 'ccy': 'USDT', 'tradeQuoteCcy': '', 'ordId': '2956222619053072384', 'clOrdId': '', 'algoClOrdId': '', 'algoId': '', 'tag': '', 'px': '3900', 'sz': '0.01', 'notionalUsd': '3.9009750000000007', 'ordType': 'limit', 'side': 'buy', 'posSide': 'net', 'tdMode': 'cross', 'accFillSz': '0', 'fillNotionalUsd': '', 'avgPx': '0', 'state': 'canceled', 'lever': '0', 'pnl': '0', 'feeCcy': 'USDT', 'fee': '0', 'rebateCcy': 'USDT', 'rebate': '0', 'category': 'normal', 'uTime': '1760604892870', 'cTime': '1760604699542', 'source': '', 'reduceOnly': 'false', 'cancelSource': '1', 'quickMgnType': '', 'stpId': '', 'stpMode': 'cancel_taker', 'attachAlgoClOrdId': '', 'lastPx': '3993.13', 'isTpLimit': 'false', 'slTriggerPx': '', 'slTriggerPxType': '', 'tpOrdPx': '', 'tpTriggerPx': '', 'tpTriggerPxType': '', 'slOrdPx': '', 'fillPx': '', 'tradeId': '', 'fillSz': '0', 'fillTime': '', 'fillPnl': '0', 'fillFee': '0', 'fillFeeCcy': '', 'execType': '', 'fillPxVol': '', 'fillPxUsd': '', 'fillMarkVol': '', 'fillFwdPx': '', 'fillMarkPx': '', 'fillIdxPx': '', 'amendSource': '', 'reqId': '', 'amendResult': '', 'code': '0', 'msg': '', 'pxType': '', 'pxUsd': '', 'pxVol': '', 'linkedAlgoOrd': {'algoId': ''}, 'attachAlgoOrds': []}
         """
-        # 提取交易对符号
-        instId = order_data.get('instId', '')
-        symbol = instId.replace("-USDT-SWAP", "")
+        try:
+            (inst_id, client_order_id, order_id, trade_id, side, order_type, state,
+             sz, fill_sz, acc_fill_sz, reduce_only, pos_side, u_time) = _order_fields(order_data)
+        except KeyError as e:
+            logger.error(f"[{self.exchange_code}] 订单更新缺少字段 {e}: {order_data}")
+            return
 
-        # 获取合约张数
-        original_quantity_contracts = float(order_data.get('sz', 0))
-        order_last_filled_quantity_contracts = float(order_data.get('fillSz', 0))
-        order_filled_accumulated_quantity_contracts = float(order_data.get('accFillSz', 0))
+        # 提取交易对符号, 驻留后下游比较可直接按引用判断
+        symbol = pair_to_symbol(okx_inst_id_to_pair(inst_id))
 
-        # 转换为币种数量
-        original_quantity = self.okx_client.convert_order_qty_to_size(symbol, original_quantity_contracts)
-        order_last_filled_quantity = self.okx_client.convert_order_qty_to_size(symbol, order_last_filled_quantity_contracts)
-        order_filled_accumulated_quantity = self.okx_client.convert_order_qty_to_size(symbol, order_filled_accumulated_quantity_contracts)
+        # 合约张数转换为币种数量
+        convert = self.okx_client.convert_order_qty_to_size
+        original_quantity = convert(symbol, float(sz or 0))
+        order_last_filled_quantity = convert(symbol, float(fill_sz or 0))
+        order_filled_accumulated_quantity = convert(symbol, float(acc_fill_sz or 0))
 
         event = OrderUpdateEvent(
             exchange_code=self.exchange_code,
             symbol=symbol,
-            client_order_id=order_data.get('clOrdId', ''),
-            order_id=order_data.get('ordId', ''),
-            trade_id=order_data.get('tradeId', ''),
-            side=order_data.get('side', '').upper(),
-            order_type=order_data.get('ordType', '').upper(),
+            client_order_id=client_order_id,
+            order_id=order_id,
+            trade_id=trade_id,
+            side=sys.intern(side.upper()),
+            order_type=sys.intern(order_type.upper()),
             original_quantity=original_quantity,
-            price=float(order_data.get('px') if order_data.get('px') else 0),
-            avg_price=float(order_data.get('avgPx') if order_data.get('avgPx') else 0),
-            order_status=order_data.get('state', '').upper(),
+            price=get_float(order_data, 'px'),
+            avg_price=get_float(order_data, 'avgPx'),
+            order_status=sys.intern(state.upper()),
             order_last_filled_quantity=order_last_filled_quantity,
             order_filled_accumulated_quantity=order_filled_accumulated_quantity,
-            last_filled_price=float(order_data.get('fillPx') if order_data.get('fillPx') else 0),
-            reduce_only=order_data.get('reduceOnly', 'false') == 'true',
-            position_side_mode=order_data.get('posSide', ''),
-            timestamp=int(order_data.get('uTime', 0))
+            last_filled_price=get_float(order_data, 'fillPx'),
+            reduce_only=reduce_only == 'true',
+            position_side_mode=pos_side,
+            timestamp=int(u_time or 0)
         )
         await self.on_order_update_callback(event)
 
@@ -284,7 +294,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
         try:
             for position_data in positions_data:
                 # 过滤掉空仓位
-                if float(position_data.get("pos", 0)) == 0:
+                if get_float(position_data, "pos") == 0:
                     continue
 
                 # 转换为标准格式
@@ -311,9 +321,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
         except Exception as e:
             logger.error(f"[{self.exchange_code}] 转换仓位数据异常: {e}")
             # 返回一个空的仓位对象
-            empty_position = OkxPositionDetail({})
-            empty_position.exchange_code = self.exchange_code
-            return empty_position
+            return self._empty_position(OkxPositionDetail)
 
     async def _listen_websocket(self):
         """持续监听 WebSocket 消息（支持自动重连）"""
@@ -329,6 +337,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
 
                 async with websockets.connect(
                         self.private_ws_url,
+                        ssl=shared_ssl_context(),
                         ping_interval=20,
                         ping_timeout=5
                 ) as websocket:
@@ -342,13 +351,13 @@ class OkxPositionWebSocket(PositionWebSocketStream):
                     if retry_count > 0:
                         logger.debug(f"[{self.exchange_code}] 重连成功！")
                     retry_count = 0
-                    self._login_sent = False
+                    self._set_authenticated(False)
 
                     # 持续接收消息
                     while self._running:
                         try:
                             message = await asyncio.wait_for(websocket.recv(), timeout=10)
-                            data = json.loads(message)
+                            data = json_loads(message)
                             await self._handle_message(data)
 
                         except asyncio.TimeoutError:
@@ -367,7 +376,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
                     return
 
                 # 连接失败，重置登录状态
-                self._login_sent = False
+                self._set_authenticated(False)
 
                 if "no pong" in str(e) or "ConnectionClosed" in str(type(e).__name__):
                     logger.warning(f"[{self.exchange_code}] WebSocket连接断开: {e}")
@@ -383,7 +392,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
 
             finally:
                 self._ws_connection = None
-                self._login_sent = False
+                self._set_authenticated(False)
 
         logger.debug(f"[{self.exchange_code}] WebSocket监听线程退出")
 
@@ -393,7 +402,7 @@ class OkxPositionWebSocket(PositionWebSocketStream):
             logger.warning(f"[{self.exchange_code}] 仓位WebSocket 已在运行")
             return
 
-        if not all([self.api_key, self.secret, self.passphrase]):
+        if not (self.api_key and self.secret and self.passphrase):
             logger.error(f"[{self.exchange_code}] 缺少必要的API凭据，无法启动私有数据流")
             return
 
@@ -8,6 +8,8 @@
 """
 import time
 from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from itertools import islice
 from typing import Optional, Callable, Dict
 from loguru import logger
 
@@ -84,6 +86,55 @@ class OrderBookData:
                 f"spread={self.spread_pct:.4%} age={age * 1000:.2f}ms)\n {self.bids[:3]} \n {self.asks[:3]} ")
 
 
+class LocalOrderBookSide:
+    """
+    本地维护的单边订单簿: price -> qty 字典 + 升序价格列表
+
+    增量更新时用 bisect 维护价格有序 (查找 O(log N), 插入/删除为 C 级内存移动),
+    发布订单簿时按顺序直接读取, 不必每次对整本重新排序
+    """
+    __slots__ = ("levels", "prices", "descending")
+
+    def __init__(self, descending: bool):
+        """
+        :param descending: True 为买盘 (价格从高到低输出), False 为卖盘
+        """
+        self.levels: Dict[float, float] = {}
+        self.prices: list = []
+        self.descending = descending
+
+    def __len__(self):
+        return len(self.levels)
+
+    def load(self, raw_levels):
+        """用快照 [[price, qty], ...] 重建档位, 只排序一次"""
+        self.levels = {float(price): float(qty) for price, qty in raw_levels}
+        self.prices = sorted(self.levels)
+
+    def update(self, price: float, qty: float):
+        """更新单个档位, qty 为 0 时删除该档位"""
+        levels = self.levels
+        if qty == 0:
+            if levels.pop(price, None) is not None:
+                prices = self.prices
+                del prices[bisect_left(prices, price)]
+        else:
+            if price not in levels:
+                insort(self.prices, price)
+            levels[price] = qty
+
+    def to_list(self, limit: Optional[int] = None) -> list:
+        """
+        按最优价在前输出 [[price, qty], ...]
+        :param limit: 只输出前 limit 档, None 为全部档位
+        """
+        levels = self.levels
+        prices = reversed(self.prices) if self.descending else self.prices
+        if limit is not None:
+            prices = islice(prices, limit)
+        return [[price, levels[price]] for price in prices]
+
+
 class OrderBookStream(ABC):
     """订单簿流监听器抽象基类"""
 
@@ -139,3 +190,11 @@ class OrderBookStream(ABC):
     def is_running(self) -> bool:
         """是否正在运行"""
         return self._running
+
+    async def __aenter__(self):
+        """async with 启动流, 退出时保证调用 stop() 释放连接与 HTTP 会话"""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
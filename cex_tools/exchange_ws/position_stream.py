@@ -6,6 +6,7 @@
 @Description : 仓位WebSocket流监听基类
 @Time        : 2025/10/15
 """
+import asyncio
 import time
 from abc import ABC, abstractmethod
 from typing import Optional, Callable, Dict, List
@@ -33,6 +34,10 @@ class PositionWebSocketStream(ABC):
         self.latest_positions: Dict[str, any] = {}  # symbol -> position_detail
         self._running = False
         self._last_update_time = 0
+        # 私有流登录/认证成功后置位, 断线时清除
+        self._authenticated = asyncio.Event()
+        # 仓位模型类 -> 转换失败时返回的空仓位
+        self._empty_positions: Dict[type, any] = {}
 
     def set_order_update_callback(self, call_back):
         self.on_order_update_callback = call_back
@@ -51,3 +56,46 @@ class PositionWebSocketStream(ABC):
     def is_running(self) -> bool:
         """是否正在运行"""
         return self._running
+
+    async def __aenter__(self):
+        """async with 启动流, 退出时保证调用 stop() 关闭连接并取消后台任务"""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def _empty_position(self, model_cls):
+        """
+        转换仓位数据失败时返回的空仓位对象
+
+        每个模型类只构造一次并复用, 调用方不应修改返回的对象
+        """
+        empty_position = self._empty_positions.get(model_cls)
+        if empty_position is None:
+            empty_position = model_cls.empty(self.exchange_code)
+            self._empty_positions[model_cls] = empty_position
+        return empty_position
+
+    def _set_authenticated(self, authenticated: bool):
+        """更新认证状态, 唤醒等待认证的协程"""
+        if authenticated:
+            self._authenticated.set()
+        else:
+            self._authenticated.clear()
+
+    async def wait_authenticated(self, timeout: float = 10.0) -> bool:
+        """
+        等待私有流认证完成
+
+        Args:
+            timeout: 超时时间（秒）
+
+        Returns:
+            bool: 超时前是否完成认证
+        """
+        try:
+            await asyncio.wait_for(self._authenticated.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
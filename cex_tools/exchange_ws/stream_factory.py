@@ -342,41 +342,44 @@ class StreamManager:
 
     def get_status_report(self) -> str:
         """获取详细状态报告"""
-        report = f"📊 订单簿流管理器状态报告\n\n"
+        # 先收集片段再一次性拼接, 避免反复 += 产生中间字符串
+        parts = ["📊 订单簿流管理器状态报告\n\n"]
+        append = parts.append
 
         # 总体统计
         total_pairs = len(self.stream_pairs)
         total_streams = sum(len(streams) for streams in self.active_streams.values())
 
-        report += f"🔢 总体统计:\n"
-        report += f"  • 活跃流对数: {total_pairs}\n"
-        report += f"  • 活跃流总数: {total_streams}\n"
-        report += f"  • 支持的交易所: {', '.join(StreamFactory.get_supported_exchanges())}\n\n"
+        append("🔢 总体统计:\n")
+        append(f"  • 活跃流对数: {total_pairs}\n")
+        append(f"  • 活跃流总数: {total_streams}\n")
+        append(f"  • 支持的交易所: {', '.join(StreamFactory.get_supported_exchanges())}\n\n")
 
         # 按交易所统计
         if self.active_streams:
-            report += f"🏢 各交易所流数量:\n"
+            append("🏢 各交易所流数量:\n")
             for exchange_code, streams in self.active_streams.items():
-                report += f"  • {exchange_code.upper()}: {len(streams)}个\n"
-            report += "\n"
+                append(f"  • {exchange_code.upper()}: {len(streams)}个\n")
+            append("\n")
+
+        current_time = asyncio.get_event_loop().time()
 
         # 活跃流对详情
         if self.stream_pairs:
-            report += f"🔗 活跃流对详情:\n"
+            append("🔗 活跃流对详情:\n")
             for key, info in self.stream_info.items():
-                runtime = asyncio.get_event_loop().time() - info['created_time']
+                runtime = current_time - info['created_time']
                 runtime_str = f"{runtime // 60:.0f}m {runtime % 60:.0f}s"
-                report += f"  • {key} (运行 {runtime_str})\n"
-                report += f"    - 回调: 交易所1={'✅' if info['callback1_set'] else '❌'}, 交易所2={'✅' if info['callback2_set'] else '❌'}\n"
-            report += "\n"
+                append(f"  • {key} (运行 {runtime_str})\n")
+                append(f"    - 回调: 交易所1={'✅' if info['callback1_set'] else '❌'}, 交易所2={'✅' if info['callback2_set'] else '❌'}\n")
+            append("\n")
 
         # 系统状态
-        current_time = asyncio.get_event_loop().time()
-        report += f"⏰ 系统状态:\n"
-        report += f"  • 当前时间: {current_time:.0f}\n"
-        report += f"  • 流管理器状态: {'🟢 正常' if total_pairs > 0 else '🟡 空闲'}\n"
+        append("⏰ 系统状态:\n")
+        append(f"  • 当前时间: {current_time:.0f}\n")
+        append(f"  • 流管理器状态: {'🟢 正常' if total_pairs > 0 else '🟡 空闲'}\n")
 
-        return report
+        return "".join(parts)
 
     def get_stream_info(self, exchange1_code: str, exchange2_code: str, symbol: str) -> Optional[Dict[str, Any]]:
         """获取指定流对的详细信息"""
@@ -13,6 +13,7 @@ from loguru import logger
 from okx.api import Public
 from okx.app import OkxSWAP
 from cex_tools.cex_enum import ExchangeEnum, TradeSide
+from cex_tools.exchange_model.base_model import okx_inst_id_to_pair
 from cex_tools.exchange_model.position_model import OkxPositionDetail
 from cex_tools.exchange_model.order_model import OkxOrder
 from cex_tools.exchange_model.kline_bar_model import OkxKlineBar
@@ -147,7 +148,7 @@ class OkxFuture:
             for d in datas:
                 t = {}
                 try:
-                    t["name"] = d["instId"].replace("-SWAP", "").replace("-", "").replace("USDT", "")
+                    t["name"] = okx_inst_id_to_pair(d["instId"]).replace("USDT", "")
                     t["midPx"] = (float(d["askPx"]) + float(d["bidPx"])) / 2
                     ret.append(t)
                 except:
@@ -674,7 +675,7 @@ class OkxFuture:
                 inst_id = item.get("instId", "")
                 if inst_id:
                     # 转换OKX格式为标准格式
-                    clean_symbol = inst_id.replace("-SWAP", "").replace("-", "")
+                    clean_symbol = okx_inst_id_to_pair(inst_id)
                     if not clean_symbol.endswith("USDT"):
                         clean_symbol += "USDT"
                 else:
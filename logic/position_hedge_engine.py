@@ -468,7 +468,7 @@ class PositionHedgeEngine:
 
             # 防止重复处理
             if order_key in self.processing_orders:
-                logger.debug(f"⏭️ 跳过重复处理的订单: {order_key}")
+                logger.debug("⏭️ 跳过重复处理的订单: {}", order_key)
                 return
 
             self.processing_orders.add(order_key)
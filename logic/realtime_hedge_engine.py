@@ -567,8 +567,8 @@ class RealtimeHedgeEngine:
             # 限制下单数量不超过第一档流动性限制
             if base_amount is None or base_amount > max_allowed_qty:
                 base_amount = max_allowed_qty
-                logger.debug(f"订单簿流动性限制: {base_amount:.4f} -> {max_allowed_qty:.4f} "
-                             f"(第一档: {first_level_qty1:.4f}/{first_level_qty2:.4f})")
+                logger.debug("订单簿流动性限制: {:.4f} -> {:.4f} (第一档: {:.4f}/{:.4f})",
+                             base_amount, max_allowed_qty, first_level_qty1, first_level_qty2)
 
         # 检查最小订单金额限制（20美金）
         # 使用两个交易所价格的平均值来计算，确保两边的订单价值都接近限制
@@ -8,6 +8,7 @@ from rich.panel import Panel
 from arbitrage_param import BinanceLighterArbitrageParam, HyperliquidLighterArbitrageParam, MultiExchangeArbitrageParam, \
     BinanceHyperliquidArbitrageParam
 from simple_pair_position_builder import simple_pair_position_builder_cli
+from utils.coroutine_utils import install_uvloop
 
 console = Console()
 
@@ -267,6 +268,7 @@ async def main():
 
 
 if __name__ == '__main__':
+    install_uvloop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
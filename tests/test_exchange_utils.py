@@ -0,0 +1,119 @@
+# coding=utf-8
+"""
+@Project     : darwin_light
+@Author      : Arson
+@File Name   : test_exchange_utils
+@Description : 测试 ExchangeUtils 的订单簿深度与批量价格比较
+@Time        : 2025/10/16
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from cex_tools.exchange_model.orderbook_model import BinanceOrderBook
+from cex_tools.exchange_utils import ExchangeUtils
+
+_ORDER_BOOK_RES = {
+    "bids": [["100.0", "1.0"], ["99.5", "2.0"], ["99.0", "3.0"]],
+    "asks": [["100.5", "1.5"], ["101.0", "2.5"], ["101.5", "0.5"]],
+}
+
+
+def _legacy_order_book(res):
+    """只有 bids/asks 档位对象列表的旧式订单簿"""
+    items = BinanceOrderBook.OrderBookItems
+    bids = [items(d) for d in res["bids"]]
+    asks = [items(d) for d in res["asks"]]
+    return SimpleNamespace(bids=bids, asks=asks, mid_price=(bids[0].price + asks[0].price) / 2)
+
+
+def test_order_book_depth_does_not_build_level_objects():
+    """数组化订单簿走 numpy 路径, 不触发 bids/asks 惰性列表的构造"""
+    orderbook = BinanceOrderBook(_ORDER_BOOK_RES)
+    depth = ExchangeUtils.calculate_order_book_depth(orderbook, depth_levels=2)
+    assert orderbook._bids is None and orderbook._asks is None
+    assert depth["bid_depth"] == pytest.approx(100.0 * 1.0 + 99.5 * 2.0)
+    assert depth["ask_depth"] == pytest.approx(100.5 * 1.5 + 101.0 * 2.5)
+    assert depth["spread"] == pytest.approx(0.5)
+    assert depth["levels_analyzed"] == 2
+
+
+def test_order_book_depth_matches_legacy_objects():
+    orderbook = BinanceOrderBook(_ORDER_BOOK_RES)
+    for depth_levels in (1, 3, 10):
+        fast = ExchangeUtils.calculate_order_book_depth(orderbook, depth_levels)
+        legacy = ExchangeUtils.calculate_order_book_depth(_legacy_order_book(_ORDER_BOOK_RES), depth_levels)
+        assert fast.keys() == legacy.keys()
+        for key in fast:
+            assert fast[key] == pytest.approx(legacy[key])
+
+
+def test_order_book_depth_invalid_input():
+    assert ExchangeUtils.calculate_order_book_depth(None) == {}
+    assert ExchangeUtils.calculate_order_book_depth(SimpleNamespace(mid_price=1)) == {}
+
+
+# 交易对 -> 各交易所价格, None 表示查询异常
+_TICK_PRICES = {
+    "BTCUSDT": {"binance": 60000.0, "okx": 60120.0, "bybit": 59990.0},  # 有套利机会
+    "ETHUSDT": {"binance": 3000.0, "okx": 3000.5, "bybit": 3000.2},  # 利润率不足
+    "SOLUSDT": {"binance": 150.0, "okx": None, "bybit": 0.0},  # 有效价格不足两个
+    "DOGEUSDT": {"binance": 0.1, "okx": 0.1, "bybit": 0.102},  # 最低价并列
+    "XRPUSDT": {"binance": None, "okx": 0.5, "bybit": 0.51},  # 部分查询异常
+}
+
+
+class _FakeExchange:
+    def __init__(self, exchange_code):
+        self.exchange_code = exchange_code
+
+    async def get_tick_price(self, symbol):
+        price = _TICK_PRICES[symbol][self.exchange_code]
+        if price is None:
+            raise RuntimeError("price unavailable")
+        return price
+
+
+_EXCHANGES = [_FakeExchange("binance"), _FakeExchange("okx"), _FakeExchange("bybit")]
+
+
+def test_compare_prices_batch_matches_per_symbol():
+    async def run():
+        codes, matrix = await ExchangeUtils.compare_prices_batch(_EXCHANGES, list(_TICK_PRICES))
+        singles = [await ExchangeUtils.compare_prices(_EXCHANGES, symbol, ttl=0) for symbol in _TICK_PRICES]
+        return codes, matrix, singles
+
+    codes, matrix, singles = asyncio.run(run())
+    assert codes == ["binance", "okx", "bybit"]
+    assert matrix.shape == (len(_TICK_PRICES), 3)
+    for row, single in zip(matrix, singles):
+        assert dict(zip(codes, row.tolist())) == single
+
+
+@pytest.mark.parametrize("min_profit_rate", [0.0, 0.001, 0.05])
+def test_find_arbitrage_opportunities_batch_matches_per_symbol(min_profit_rate):
+    async def run():
+        batch = await ExchangeUtils.find_arbitrage_opportunities_batch(_EXCHANGES, list(_TICK_PRICES),
+                                                                       min_profit_rate)
+        singles = []
+        for symbol in _TICK_PRICES:
+            prices = await ExchangeUtils.compare_prices(_EXCHANGES, symbol, ttl=0)
+            opportunity = ExchangeUtils._arbitrage_from_prices(symbol, prices, min_profit_rate)
+            if opportunity:
+                singles.append(opportunity)
+        return batch, singles
+
+    batch, singles = asyncio.run(run())
+    assert len(batch) == len(singles)
+    for got, expected in zip(batch, singles):
+        assert got.keys() == expected.keys()
+        for key in ("symbol", "buy_exchange", "sell_exchange", "all_prices"):
+            assert got[key] == expected[key]
+        for key in ("buy_price", "sell_price", "profit_rate", "profit_amount"):
+            assert got[key] == pytest.approx(expected[key])
+
+
+def test_find_arbitrage_opportunities_batch_empty_input():
+    assert asyncio.run(ExchangeUtils.find_arbitrage_opportunities_batch(_EXCHANGES, [])) == []
+    assert asyncio.run(ExchangeUtils.find_arbitrage_opportunities_batch([], ["BTCUSDT"])) == []
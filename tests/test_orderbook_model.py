@@ -0,0 +1,78 @@
+# coding=utf-8
+"""
+@Project     : darwin_light
+@Author      : Arson
+@File Name   : test_orderbook_model
+@Description : 测试多个订单簿的批量视图
+@Time        : 2025/10/16
+"""
+import numpy as np
+import pytest
+
+from cex_tools.exchange_model.orderbook_model import BinanceOrderBook, BatchOrderBookView, parse_levels
+
+
+def _book(pair, bids, asks):
+    return BinanceOrderBook({"bids": bids, "asks": asks}, pair)
+
+
+def _empty_side_book(pair, bids, asks):
+    """BinanceOrderBook 构造时要求两侧都有档位, 单侧为空的订单簿直接设置档位数组"""
+    book = BinanceOrderBook.__new__(BinanceOrderBook)
+    book._pair = pair
+    book._set_levels(parse_levels(asks), parse_levels(bids))
+    return book
+
+
+_BOOKS = [
+    _book("BTCUSDT",
+          [["100", "1"], ["99", "2"], ["98", "3"], ["97", "1"]],
+          [["101", "1"], ["102", "4"]]),
+    _book("ETHUSDT",
+          [["10", "5"]],
+          [["10.5", "2"], ["11", "1"], ["11.5", "3"], ["12", "2"], ["12.5", "1"]]),
+    _book("SOLUSDT",
+          [["1.0", "10"], ["0.9", "20"]],
+          [["1.1", "10"], ["1.2", "30"], ["1.3", "5"]]),
+]
+
+
+def test_ragged_depths_match_single_books():
+    view = BatchOrderBookView(_BOOKS)
+    assert view.pairs == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    assert view.bid_px.shape == (3, 4)
+    assert view.ask_px.shape == (3, 5)
+
+    np.testing.assert_allclose(view.get_mid_prices(), [book.get_mid_price() for book in _BOOKS])
+    np.testing.assert_allclose(view.get_sell_price_vwap(), [book.get_sell_price_vwap() for book in _BOOKS])
+    np.testing.assert_allclose(view.get_buy_price_vwap(), [book.get_buy_price_vwap() for book in _BOOKS])
+
+    mids = view.to_dict(view.get_mid_prices())
+    assert mids["ETHUSDT"] == pytest.approx(10.25)
+
+
+@pytest.mark.parametrize("bids, asks", [
+    ([], [["101", "1"], ["102", "2"]]),
+    ([["100", "1"], ["99", "2"]], []),
+])
+def test_empty_side(bids, asks):
+    """批量中所有订单簿的某一侧都为空时, 中间价为 0, 另一侧 VWAP 仍可计算"""
+    books = [_empty_side_book("BTCUSDT", bids, asks), _empty_side_book("ETHUSDT", bids, asks)]
+    view = BatchOrderBookView(books)
+    np.testing.assert_array_equal(view.get_mid_prices(), [0.0, 0.0])
+    np.testing.assert_allclose(view.get_sell_price_vwap(), [book.get_sell_price_vwap() for book in books])
+    np.testing.assert_allclose(view.get_buy_price_vwap(), [book.get_buy_price_vwap() for book in books])
+
+
+def test_mixed_empty_side():
+    """只有部分订单簿一侧为空时, 该订单簿中间价为 0, 其余不受影响"""
+    books = [_BOOKS[0], _empty_side_book("ETHUSDT", [], [["10.5", "2"]])]
+    view = BatchOrderBookView(books)
+    np.testing.assert_allclose(view.get_mid_prices(), [_BOOKS[0].get_mid_price(), 0.0])
+
+
+def test_empty_batch():
+    view = BatchOrderBookView([])
+    assert view.get_mid_prices().shape == (0,)
+    assert view.get_sell_price_vwap().shape == (0,)
+    assert view.get_buy_price_vwap().shape == (0,)
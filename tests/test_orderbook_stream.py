@@ -0,0 +1,75 @@
+# coding=utf-8
+"""
+@Project     : darwin_light
+@Author      : Arson
+@File Name   : test_orderbook_stream
+@Description : 测试本地维护的有序单边订单簿
+@Time        : 2025/10/16
+"""
+import random
+
+from cex_tools.exchange_ws.orderbook_stream import LocalOrderBookSide
+
+_SNAPSHOT = [["100.5", "1"], ["99.0", "3"], ["100.0", "2"], ["98.5", "4"]]
+
+
+def test_load_snapshot():
+    bids = LocalOrderBookSide(descending=True)
+    bids.load(_SNAPSHOT)
+    assert len(bids) == 4
+    assert bids.prices == [98.5, 99.0, 100.0, 100.5]
+    assert bids.to_list() == [[100.5, 1.0], [100.0, 2.0], [99.0, 3.0], [98.5, 4.0]]
+
+    # 重新加载快照会替换原有档位
+    bids.load([["1", "1"]])
+    assert bids.to_list() == [[1.0, 1.0]]
+
+
+def test_incremental_updates():
+    asks = LocalOrderBookSide(descending=False)
+    asks.load(_SNAPSHOT)
+
+    asks.update(99.5, 5.0)  # 新增档位
+    asks.update(100.0, 7.0)  # 覆盖已有档位
+    asks.update(98.5, 0.0)  # 删除已有档位
+    asks.update(97.0, 0.0)  # 删除不存在的档位不影响订单簿
+
+    assert asks.prices == [99.0, 99.5, 100.0, 100.5]
+    assert asks.to_list() == [[99.0, 3.0], [99.5, 5.0], [100.0, 7.0], [100.5, 1.0]]
+
+    # 删除全部档位
+    for price in list(asks.prices):
+        asks.update(price, 0.0)
+    assert len(asks) == 0 and asks.prices == [] and asks.to_list() == []
+
+
+def test_to_list_limit_order():
+    bids = LocalOrderBookSide(descending=True)
+    asks = LocalOrderBookSide(descending=False)
+    bids.load(_SNAPSHOT)
+    asks.load(_SNAPSHOT)
+
+    assert bids.to_list(2) == [[100.5, 1.0], [100.0, 2.0]]
+    assert asks.to_list(2) == [[98.5, 4.0], [99.0, 3.0]]
+    assert asks.to_list(0) == []
+    assert asks.to_list(10) == asks.to_list()
+
+
+def test_matches_full_resort():
+    """随机增量更新后与字典整本排序的结果一致"""
+    rng = random.Random(7)
+    for descending in (True, False):
+        side = LocalOrderBookSide(descending)
+        snapshot = [[str(rng.randint(1, 500) / 10), str(rng.randint(0, 9))] for _ in range(200)]
+        side.load(snapshot)
+        reference = {float(p): float(q) for p, q in snapshot}
+        for _ in range(3000):
+            price, qty = rng.randint(1, 600) / 10, rng.choice([0.0, 0.0, 1.0, 2.5])
+            side.update(price, qty)
+            if qty == 0:
+                reference.pop(price, None)
+            else:
+                reference[price] = qty
+        expected = [[p, reference[p]] for p in sorted(reference, reverse=descending)]
+        assert side.to_list() == expected
+        assert side.to_list(20) == expected[:20]
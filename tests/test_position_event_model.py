@@ -0,0 +1,52 @@
+# coding=utf-8
+"""
+@Project     : darwin_light
+@Author      : Arson
+@File Name   : test_position_event_model
+@Description : 测试由仓位详情构造仓位事件
+@Time        : 2025/10/16
+"""
+from cex_tools.exchange_model.base_model import TradeDirection
+from cex_tools.exchange_model.position_event_model import PositionEvent, PositionEventType
+from cex_tools.exchange_model.position_model import BinancePositionDetail
+
+
+def _binance_position(amt, pnl="0"):
+    return BinancePositionDetail({
+        "symbol": "BTCUSDT",
+        "positionAmt": amt,
+        "entryPrice": "60000",
+        "markPrice": "61000",
+        "notional": str(float(amt) * 61000),
+        "unRealizedProfit": pnl,
+        "positionSide": "BOTH",
+    }, exchange_code="binance")
+
+
+def test_position_event_from_binance_position():
+    """仓位方向为字符串时可以正常构造事件并导出字典"""
+    previous = _binance_position("0.5", "100")
+    current = _binance_position("-0.2", "-20")
+    event = PositionEvent.create_from_position_detail("binance", current, previous, PositionEventType.DECREASE)
+
+    assert event.symbol == "BTC"
+    assert event.position_side == TradeDirection.short
+    assert event.position_size == -0.2
+    assert event.entry_price == 60000
+    assert event.mark_price == 61000
+    assert event.leverage is None
+    assert event.is_short_position()
+    assert abs(event.size_change - (-0.7)) < 1e-12
+    assert event.pnl_change == -120
+
+    data = event.to_dict()
+    assert data["position_side"] == TradeDirection.short
+    assert data["event_type"] == "decrease"
+    str(event)
+
+
+def test_position_event_without_detail():
+    event = PositionEvent("binance", "BTC", PositionEventType.CLOSE)
+    assert event.position_side is None
+    assert event.position_size == 0
+    assert not event.is_open_position()
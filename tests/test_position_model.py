@@ -0,0 +1,124 @@
+# coding=utf-8
+"""
+@Project     : darwin_light
+@Author      : Arson
+@File Name   : test_position_model
+@Description : 测试仓位模型: 空仓位对象与列式仓位数据
+@Time        : 2025/10/16
+"""
+import math
+
+import numpy as np
+import pytest
+
+from cex_tools.exchange_model.base_model import TradeDirection
+from cex_tools.exchange_model.position_model import POSITION_DETAIL_CLASSES, BinancePositionDetail, \
+    HyperliquidPositionDetail, PositionBook, parse_binance_positions
+from cex_tools.exchange_ws.position_stream import PositionWebSocketStream
+
+
+class _DummyPositionStream(PositionWebSocketStream):
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+
+def test_empty_position_for_every_model():
+    """每个仓位模型都能构造空仓位, 且同一模型只构造一次"""
+    stream = _DummyPositionStream("test")
+    for model_cls in set(POSITION_DETAIL_CLASSES.values()):
+        empty_position = stream._empty_position(model_cls)
+        assert isinstance(empty_position, model_cls)
+        assert empty_position.exchange_code == "test"
+        assert empty_position.positionAmt == 0
+        assert empty_position.notional == 0
+        assert empty_position.profit_rate == 0.0
+        assert not empty_position.is_long
+        # 基类声明的属性在所有交易所的仓位上都可读取
+        assert empty_position.leverage is None or empty_position.leverage >= 0
+        assert empty_position.maxNotionalValue is None or empty_position.maxNotionalValue >= 0
+        assert stream._empty_position(model_cls) is empty_position
+        str(empty_position)
+
+
+_BINANCE_RAW = [
+    {"symbol": "BTCUSDT", "entryPrice": "60000", "markPrice": "61000", "liquidationPrice": "30000",
+     "positionAmt": "0.5", "notional": "30500", "unRealizedProfit": "500"},
+    {"symbol": "ETHUSDT", "entryPrice": "3000", "markPrice": "2900", "liquidationPrice": "4000",
+     "positionAmt": "-2", "notional": "-5800", "unRealizedProfit": "200"},
+    {"symbol": "SOLUSDT", "entryPrice": "150", "markPrice": "150", "liquidationPrice": "0",
+     "positionAmt": "0", "notional": "0", "unRealizedProfit": "0"},
+]
+
+
+def _hyperliquid_position(coin, szi, position_value, pnl):
+    return HyperliquidPositionDetail({
+        "coin": coin, "szi": szi, "entryPx": "100", "liquidationPx": "50", "unrealizedPnl": pnl,
+        "positionValue": position_value, "leverage": {"type": "cross", "value": "5"},
+        "cumFunding": {"sinceOpen": "1.5"},
+    }, exchange_code="hyperliquid")
+
+
+def test_parse_binance_positions_matches_objects():
+    """列式解析结果与逐个构造 BinancePositionDetail 一致, notional 为 0 时收益率为 0"""
+    soa = parse_binance_positions(_BINANCE_RAW)
+    positions = [BinancePositionDetail(raw) for raw in _BINANCE_RAW]
+
+    assert len(soa) == 3
+    assert list(soa.pairs) == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    assert list(soa.symbols) == [p.symbol for p in positions]
+    np.testing.assert_allclose(soa.positionAmt, [p.positionAmt for p in positions])
+    np.testing.assert_allclose(soa.notional, [p.notional for p in positions])
+    np.testing.assert_allclose(soa.profit_rate(), [p.profit_rate for p in positions])
+    assert soa.profit_rate()[2] == 0.0
+    assert list(soa.position_side) == [TradeDirection.long, TradeDirection.short, None]
+
+
+def test_parse_binance_positions_empty():
+    """空列表也能得到 6 个长度为 0 的数值列"""
+    soa = parse_binance_positions([])
+    assert len(soa) == 0
+    assert soa.positionAmt.shape == (0,)
+    assert soa.profit_rate().shape == (0,)
+    assert soa.position_side.shape == (0,)
+
+
+def test_position_book_across_exchanges():
+    """跨交易所仓位簿: 收益率与逐对象一致, 缺失的 markPrice 记为 nan"""
+    positions = [BinancePositionDetail(raw, exchange_code="binance") for raw in _BINANCE_RAW]
+    positions.append(_hyperliquid_position("ETH", "-1.5", "4500", "-45"))
+    positions.append(_hyperliquid_position("DOGE", "0", "0", "0"))
+    book = PositionBook.from_positions(positions)
+
+    assert len(book) == 5
+    assert list(book.pairs) == ["BTCUSDT", "ETHUSDT", "SOLUSDT", "ETHUSDT", "DOGEUSDT"]
+    np.testing.assert_allclose(book.profit_rate_vector(), [p.profit_rate for p in positions])
+    assert book.profit_rate_vector()[2] == 0.0 and book.profit_rate_vector()[4] == 0.0
+    assert math.isnan(book.markPrice[3]) and math.isnan(book.markPrice[4])
+    assert book.markPrice[0] == 61000
+    assert book.total_notional() == pytest.approx(30500 + 5800 + 4500)
+    assert book.total_unrealized_pnl() == pytest.approx(500 + 200 - 45)
+
+
+def test_position_book_empty():
+    book = PositionBook.from_positions([])
+    assert len(book) == 0
+    assert book.profit_rate_vector().shape == (0,)
+    assert book.total_notional() == 0
+    assert book.total_unrealized_pnl() == 0
+
+
+def test_binance_get_all_cur_positions_array():
+    """BinanceFuture 过滤空仓后返回列式仓位数据"""
+    binance_future = pytest.importorskip("cex_tools.binance_future")
+    client = binance_future.BinanceFuture.__new__(binance_future.BinanceFuture)
+    client.recvWindow = 60000
+    client.get_position_risk = lambda **kwargs: _BINANCE_RAW
+    soa = client.get_all_cur_positions_array()
+    assert list(soa.pairs) == ["BTCUSDT", "ETHUSDT"]
+    np.testing.assert_allclose(soa.positionAmt, [0.5, -2])
+
+    client.get_position_risk = lambda **kwargs: []
+    assert len(client.get_all_cur_positions_array()) == 0
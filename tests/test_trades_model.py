@@ -0,0 +1,42 @@
+# coding=utf-8
+"""
+@Project     : darwin_light
+@Author      : Arson
+@File Name   : test_trades_model
+@Description : 测试成交数据模型的买卖方向解析
+@Time        : 2025/10/16
+"""
+import pytest
+
+from cex_tools.exchange_model.base_model import TradeDirection
+from cex_tools.exchange_model.trades_model import OkxTradeModel, HyperLiquidTradeModel
+
+
+def _okx_trade(side):
+    return {"instId": "BTC-USDT-SWAP", "tradeId": "1", "px": "100", "sz": "2", "side": side,
+            "ts": "1760604892870", "count": "1"}
+
+
+def _hl_trade(side, px, sz):
+    return {"coin": "BTC", "tid": 1, "px": px, "sz": sz, "side": side, "time": 1760604892870}
+
+
+@pytest.mark.parametrize("side, expected", [
+    ("buy", TradeDirection.long),
+    ("sell", TradeDirection.short),
+    ("unknown", TradeDirection.short),
+])
+def test_okx_trade_side(side, expected):
+    assert OkxTradeModel(_okx_trade(side)).side == expected
+
+
+def test_hyperliquid_trade_side_sign():
+    trades = HyperLiquidTradeModel([_hl_trade("B", "100", "3"), _hl_trade("A", "100", "1")])
+    assert trades.total_volume == pytest.approx(200)
+    assert trades.side == TradeDirection.long
+
+    # 未知的 side 与卖方向一样计为负, 不中断整批解析
+    trades = HyperLiquidTradeModel([_hl_trade("B", "100", "1"), _hl_trade("X", "100", "3")])
+    assert trades.total_volume == pytest.approx(-200)
+    assert trades.side == TradeDirection.short
+    assert trades.size == pytest.approx(4)
@@ -14,6 +14,20 @@ from typing import Any, Callable, Optional, Union
 from loguru import logger
 
 
+def install_uvloop() -> bool:
+    """
+    安装 uvloop 事件循环策略(可选依赖), 未安装时保持默认事件循环
+
+    Returns:
+        是否已启用 uvloop
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
 
 def run_coroutine_sync(coro: Any, timeout: Optional[float] = None) -> Any:
     """
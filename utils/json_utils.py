@@ -0,0 +1,26 @@
+# coding=utf-8
+"""
+@Project     : darwin_light
+@Author      : Arson
+@File Name   : json_utils
+@Description : JSON 编解码, 安装了 orjson 时优先使用, 否则回退到标准库 json
+@Time        : 2025/10/16
+"""
+try:
+    import orjson
+
+    # 同时接受 str 与 bytes
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        """序列化为 JSON 字符串(WebSocket 文本帧)"""
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    import json
+
+    json_loads = json.loads
+
+    def json_dumps(obj) -> str:
+        """序列化为 JSON 字符串(WebSocket 文本帧)"""
+        return json.dumps(obj, separators=(",", ":"))
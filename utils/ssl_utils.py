@@ -0,0 +1,20 @@
+# coding=utf-8
+"""
+@Project     : darwin_light
+@Author      : Arson
+@File Name   : ssl_utils
+@Description : 进程内共享的 TLS 上下文, 避免每次 WebSocket (重)连接都重新加载系统 CA 证书
+@Time        : 2025/10/16
+"""
+import ssl
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def shared_ssl_context() -> ssl.SSLContext:
+    """
+    获取共享的客户端 TLS 上下文
+
+    首次调用时创建并加载系统 CA, 之后所有连接复用同一个对象
+    """
+    return ssl.create_default_context()